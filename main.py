@@ -5,6 +5,7 @@ import json
 import logging
 import os
 import secrets
+import sys
 import time
 from contextlib import asynccontextmanager
 
@@ -44,6 +45,14 @@ CONFIG_FIELDS = [
         "placeholder": "(optional — leave empty to use polling mode)",
         "help": "Only needed for webhook mode. Leave empty to use automatic polling (no public URL required).",
     },
+    {
+        "key": "TELEGRAM_WEBHOOK_URL",
+        "label": "Telegram Webhook URL",
+        "section": "messaging",
+        "type": "text",
+        "placeholder": "https://your-host/telegram/webhook",
+        "help": "Optional: public URL of the /telegram/webhook route. When set together with the secret, the webhook is registered on startup.",
+    },
     {
         "key": "SLACK_BOT_TOKEN",
         "label": "Slack Bot Token",
@@ -116,6 +125,14 @@ CONFIG_FIELDS = [
         "placeholder": "12345678",
         "help": "Your ClickUp workspace/team ID.",
     },
+    {
+        "key": "CLICKUP_WEBHOOK_SECRET",
+        "label": "ClickUp Webhook Secret",
+        "section": "integrations",
+        "type": "password",
+        "placeholder": "(optional)",
+        "help": "Secret of a ClickUp webhook pointed at /clickup/webhook. Keeps the local task mirror (CLICKUP_TASK_MIRROR=true) up to date.",
+    },
     {
         "key": "GITHUB_TOKEN",
         "label": "GitHub Personal Access Token",
@@ -291,6 +308,12 @@ async def lifespan(app: FastAPI):
     _start_telegram_poller()
     _start_slack_handler()
 
+    from personal_clone import config
+
+    if config.CLICKUP_TASK_MIRROR:
+        from personal_clone.tools.clickup_mirror import schedule_reconciliation
+        schedule_reconciliation(scheduler)
+
     yield
 
     # Shutdown
@@ -307,6 +330,24 @@ async def lifespan(app: FastAPI):
             await _slack_task
         except asyncio.CancelledError:
             pass
+    from personal_clone.telegram_poller import close_webhook_dispatcher
+    await close_webhook_dispatcher()
+    # Only close Pinecone clients if the tools were ever loaded
+    pinecone_tools = sys.modules.get("personal_clone.tools.pinecone_tools")
+    if pinecone_tools:
+        try:
+            await pinecone_tools.close_pinecone_clients()
+        except Exception:
+            logger.exception("Failed to close Pinecone clients")
+    clickup_tools = sys.modules.get("personal_clone.tools.clickup_tools")
+    if clickup_tools:
+        try:
+            await clickup_tools.close_clickup_client()
+        except Exception:
+            logger.exception("Failed to close ClickUp client")
+    clickup_mirror = sys.modules.get("personal_clone.tools.clickup_mirror")
+    if clickup_mirror:
+        await clickup_mirror.close_mirror()
     scheduler.shutdown()
     logger.info("Scheduler stopped.")
 
@@ -363,6 +404,54 @@ async def setup_post(request: Request):
     return templates.TemplateResponse("setup.html", ctx)
 
 
+@fastapi_app.post("/telegram/webhook")
+async def telegram_webhook(request: Request):
+    """Receive Telegram updates in webhook mode and queue them for processing."""
+    secret = os.environ.get("TELEGRAM_WEBHOOK_SECRET", "")
+    provided = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+    if not secret or not hmac.compare_digest(provided, secret):
+        return JSONResponse({"ok": False, "error": "forbidden"}, status_code=403)
+
+    try:
+        update = await request.json()
+    except ValueError:
+        return JSONResponse({"ok": False, "error": "invalid payload"}, status_code=400)
+    if not isinstance(update, dict):
+        return JSONResponse({"ok": False, "error": "invalid payload"}, status_code=400)
+
+    from personal_clone.telegram_poller import dispatch_webhook_update
+    accepted = await dispatch_webhook_update(update, get_runner, process_init_command)
+    if not accepted:
+        # Telegram retries non-2xx deliveries, which gives the chat time to drain
+        return JSONResponse({"ok": False, "error": "busy"}, status_code=429)
+    return {"ok": True}
+
+
+@fastapi_app.post("/clickup/webhook")
+async def clickup_webhook(request: Request):
+    """Receive ClickUp task events and apply them to the local task mirror."""
+    secret = os.environ.get("CLICKUP_WEBHOOK_SECRET", "")
+    body = await request.body()
+    provided = request.headers.get("X-Signature", "")
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    if not secret or not hmac.compare_digest(provided, expected):
+        return JSONResponse({"ok": False, "error": "forbidden"}, status_code=403)
+
+    try:
+        event = json.loads(body)
+    except ValueError:
+        return JSONResponse({"ok": False, "error": "invalid payload"}, status_code=400)
+    if not isinstance(event, dict):
+        return JSONResponse({"ok": False, "error": "invalid payload"}, status_code=400)
+
+    from personal_clone import config
+
+    if config.CLICKUP_TASK_MIRROR:
+        from personal_clone.tools.clickup_mirror import handle_webhook_event
+        handle_webhook_event(event)
+    return {"ok": True}
+
+
 @fastapi_app.get("/health")
 def health_check():
     configured = {k for k in ALLOWED_CONFIG_KEYS if os.environ.get(k)}
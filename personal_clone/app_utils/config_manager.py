@@ -9,6 +9,8 @@ ALLOWED_CONFIG_KEYS = frozenset({
     "GEMINI_API_KEY",
     "TELEGRAM_BOT_TOKEN",
     "TELEGRAM_WEBHOOK_SECRET",
+    "TELEGRAM_WEBHOOK_URL",
+    "TELEGRAM_STREAM_REPLIES",
     "SLACK_BOT_TOKEN",
     "SLACK_APP_TOKEN",
     "SLACK_SIGNING_SECRET",
@@ -18,10 +20,14 @@ ALLOWED_CONFIG_KEYS = frozenset({
     "CLAUDE_API_KEY",
     "CLICKUP_API_TOKEN",
     "CLICKUP_TEAM_ID",
+    "CLICKUP_WEBHOOK_SECRET",
+    "CLICKUP_TASK_MIRROR",
     "GITHUB_TOKEN",
     "DEFAULT_GITHUB_REPO",
+    "GITHUB_LOCAL_MIRROR",
     "PINECONE_API_KEY",
     "PINECONE_INDEX_NAME",
+    "PINECONE_LOCAL_MIRROR",
     "BQ_GCP_SERVICE_ACCOUNT_INFO",
     "GOOGLE_CLOUD_PROJECT",
     "GOOGLE_CLOUD_LOCATION",
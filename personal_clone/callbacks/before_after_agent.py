@@ -1,11 +1,16 @@
+import asyncio
+import logging
+
 from google.adk.agents.callback_context import CallbackContext
 from google.genai import types
 
 from .. import config
 from ..tools.datetime_tools import get_current_datetime
-from ..tools.pinecone_tools import get_person_from_search, search_memories_prefetch
+from ..tools.pinecone_tools import get_person_by_user_id, search_memories_prefetch
 from ..tools.vertex_tools import search_file_store
 
+logger = logging.getLogger(__name__)
+
 
 async def state_setter(
     callback_context: CallbackContext,
@@ -38,6 +43,8 @@ async def state_setter(
         callback_context.state["clickup_user_info"] = {}
     if "current_goals" not in current_state:
         callback_context.state["current_goals"] = {}
+    if "prefetch_timeouts" not in current_state:
+        callback_context.state["prefetch_timeouts"] = []
     callback_context.state["current_datetime"] = get_current_datetime()
 
 
@@ -94,6 +101,46 @@ async def personal_agents_checker(
         )
 
 
+async def _run_prefetch_sources(
+    sources: dict, source_timeout: float, deadline: float
+) -> tuple[dict, list[str]]:
+    """
+    Runs prefetch coroutines concurrently.
+
+    Each source gets ``source_timeout`` seconds and the whole fan-out gets
+    ``deadline`` seconds; sources still running after that are cancelled.
+    Returns the results of the sources that finished and the names of those
+    that timed out.
+    """
+    tasks = {
+        name: asyncio.create_task(asyncio.wait_for(coro, source_timeout))
+        for name, coro in sources.items()
+    }
+    if not tasks:
+        return {}, []
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = {}
+    timed_out = []
+    for name, task in tasks.items():
+        if task in pending:
+            timed_out.append(name)
+            continue
+        try:
+            results[name] = task.result()
+        except asyncio.TimeoutError:
+            timed_out.append(name)
+        except Exception:
+            logger.exception("Prefetch source %s failed", name)
+    if timed_out:
+        logger.warning("Prefetch sources timed out: %s", ", ".join(timed_out))
+    return results, timed_out
+
+
 async def prefetch_memories(
     callback_context: CallbackContext,
 ) -> types.Content | None:
@@ -124,39 +171,31 @@ async def prefetch_memories(
         ):
             return
 
-        if user_id in config.SUPERUSERS and callback_context.state.get(
-            "answer_validation", {}
-        ).get("recall"):
-            personal_future = search_memories_prefetch(
+        recall = callback_context.state.get("answer_validation", {}).get("recall")
+        sources = {}
+        if user_id in config.SUPERUSERS and recall:
+            sources["personal"] = search_memories_prefetch(
                 user_id, "personal", last_user_message, 1
             )
-        else:
-            personal_future = None
-
         if (
             user_id.lower().endswith(config.TEAM_DOMAIN) or user_id in config.SUPERUSERS
-        ) and callback_context.state.get("answer_validation", {}).get("recall"):
-            professional_future = search_memories_prefetch(
+        ) and recall:
+            sources["professional"] = search_memories_prefetch(
                 user_id, "professional", last_user_message, 1
             )
-            vertex_future = search_file_store(
+            sources["vertex"] = search_file_store(
                 query=last_user_message, store_name="rag_documents"
             )
-        else:
-            professional_future = None
-            vertex_future = None
-
-        people_future = search_memories_prefetch(user_id, "people", user_id, 3)
+        sources["people"] = get_person_by_user_id(user_id)
 
-        memory_recall = await personal_future if personal_future else None
-        memory_recall_professional = (
-            await professional_future if professional_future else None
-        )
-        vertex_recall = await vertex_future if vertex_future else None
-        people_recall_results = await people_future
-        people_recall = (
-            people_recall_results.get("search_results") if people_recall_results else []
+        results, timed_out = await _run_prefetch_sources(
+            sources, config.PREFETCH_SOURCE_TIMEOUT, config.PREFETCH_DEADLINE
         )
+        callback_context.state["prefetch_timeouts"] = timed_out
+
+        memory_recall = results.get("personal")
+        memory_recall_professional = results.get("professional")
+        vertex_recall = results.get("vertex")
 
         callback_context.state["memory_context_professional"] = (
             memory_recall_professional.get("search_results")
@@ -167,7 +206,5 @@ async def prefetch_memories(
         callback_context.state["memory_context"] = (
             memory_recall.get("search_results") if memory_recall else None
         )
-        callback_context.state["user_related_context"] = (
-            get_person_from_search(people_recall, user_id) if people_recall else None
-        )
+        callback_context.state["user_related_context"] = results.get("people")
         callback_context.state["vertex_context"] = vertex_recall
@@ -31,8 +31,24 @@ CLAUDE_API_KEY = os.environ.get("CLAUDE_API_KEY", "")
 
 CLICKUP_API_TOKEN = os.environ.get("CLICKUP_API_TOKEN", "")
 CLICKUP_TEAM_ID = os.environ.get("CLICKUP_TEAM_ID", "")
+CLICKUP_WEBHOOK_SECRET = os.environ.get("CLICKUP_WEBHOOK_SECRET", "")
+# Answer task queries from a local SQLite mirror kept fresh by webhooks
+CLICKUP_TASK_MIRROR = os.environ.get("CLICKUP_TASK_MIRROR", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+CLICKUP_MIRROR_DB = os.environ.get("CLICKUP_MIRROR_DB", "./data/clickup_tasks.db")
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
 DEFAULT_GITHUB_REPO = os.environ.get("DEFAULT_GITHUB_REPO", "")
+GITHUB_CACHE_DIR = os.environ.get("GITHUB_CACHE_DIR", "./data/github_cache")
+# Serve reads of DEFAULT_GITHUB_REPO from a local bare clone (needs the git CLI)
+GITHUB_LOCAL_MIRROR = os.environ.get("GITHUB_LOCAL_MIRROR", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+GITHUB_MIRROR_DIR = os.environ.get("GITHUB_MIRROR_DIR", "./data/github_mirror")
 
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN", "")
@@ -42,6 +58,16 @@ PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", "")
 PINECONE_INDEX_NAME = os.environ.get("PINECONE_INDEX_NAME", "")
 PINECONE_PERSONAL_NAMESPACE = "personal"
 PINECONE_PROFESSIONAL_NAMESPACE = "professional"
+# Serve searches from a local NumPy copy of the namespaces (needs numpy)
+PINECONE_LOCAL_MIRROR = os.environ.get("PINECONE_LOCAL_MIRROR", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PINECONE_MIRROR_DIR = os.environ.get("PINECONE_MIRROR_DIR", "./data/pinecone_mirror")
+PEOPLE_IDENTITY_INDEX_PATH = os.environ.get(
+    "PEOPLE_IDENTITY_INDEX_PATH", "./data/people_identity.json"
+)
 
 MEMORY_CATEGORIES = {
     "idea": "New opportunities, proposals, brainstorms, pilots (not yet executed).",
@@ -60,6 +86,10 @@ MEMORY_CATEGORIES = {
 SUPERUSERS = os.getenv("SUPERUSERS", "").split(",")
 TEAM_DOMAIN = os.getenv("TEAM_DOMAIN", "")
 
+# Memory prefetch: per-source timeout and overall deadline, in seconds
+PREFETCH_SOURCE_TIMEOUT = float(os.getenv("PREFETCH_SOURCE_TIMEOUT", "4"))
+PREFETCH_DEADLINE = float(os.getenv("PREFETCH_DEADLINE", "6"))
+
 
 # MODELS MANAGEMENT
 def create_planner(mode: Literal["built-in", "react"] | None = None):
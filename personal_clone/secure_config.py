@@ -51,7 +51,7 @@ def capture_key(session_id: str, value: str) -> dict:
     os.environ[key_name] = value
 
     # Restart Telegram poller if messaging config changed
-    if key_name in ("TELEGRAM_BOT_TOKEN", "TELEGRAM_WEBHOOK_SECRET"):
+    if key_name in ("TELEGRAM_BOT_TOKEN", "TELEGRAM_WEBHOOK_SECRET", "TELEGRAM_WEBHOOK_URL"):
         try:
             # Import main here to avoid circular dependency
             import sys
@@ -19,6 +19,7 @@ def create_clickup_agent(name="clickup_agent"):
         Don't bother the user with technical questions about ClickUp, use the tools to get the information you need.
         Only engage the user if you are missing information that you cannot get from ClickUp directly.
         When creating a new task - always confirm the creation with the task link (url)
+        When creating or updating several tasks (e.g. breaking a project into subtasks), use `create_tasks` / `update_tasks` once with all of them instead of one call per task.
         """,
         # tools=[create_clickup_toolset()],
         tools=clickup_toolset,
@@ -132,6 +132,10 @@ def create_github_agent_instruction():
         # TOOLS_INTEGRATION
             ## uses
                 - GitHub API (branch, commits, create/update file, create PR)
+                - `search_code` first for "where is X defined/used" questions on the default repo (kind='symbol' for definitions, 'regex' for usages)
+                - `grep_repo` to find where something is used or defined and `diff_refs` to review a branch against master (served from a local clone of the default repo)
+                - `read_files` to read several files (a list of paths or a glob such as 'src/**/*.py') in one call; use `read_file_contents` only for a single file
+                - `commit_files` to commit a multi-file change (including deletions) as a single commit; use `commit_to_branch` only for single-file edits
                 - memory_agent_personal (for storing PR metadata and related design decisions)
                 - code_executor_agent (only if safe, strictly sandboxed; prefer not to execute arbitrary code without user confirmation)
                 - CI runner via repository (trigger and read status)
@@ -45,7 +45,7 @@ def create_memory_agent_instruction():
     </SPECIAL INSTRUCTIONS FOR UPDATING MEMORIES>
 
     <MEMORY MANAGEMENT WORKFLOW>
-        0. FIRST, ALWAYS search the namespaces you have access to for the exact input the user has submitted.
+        0. `create_memory` and `create_people` check for duplicates automatically and return any matches in `possible_duplicates` together with the confirmation request - there is no need to search before creating. Search first only when the user asks about existing records.
         1. Understand the user's request and determine the appropriate namespace (`professional` for job-related records, `personal` for personal intimate memories).
         2. Inspect the function declarations to understand all Required and Optional fields. Pay attention to descriptions.
         4. Call the functions from your toolset:
@@ -60,7 +60,7 @@ def create_memory_agent_instruction():
 
         1.  **Always Check for Existing Records Before Creating:**
             *   **Purpose:** Prevent duplicate entries and maintain data integrity.
-            *   **Method:** Before inserting a new person, perform a search on the people table using available identifiers (first name, last name, emails, Telegram handles, phone numbers). Check all relevant user_ids values.
+            *   **Method:** Pass all known identifiers (emails, Telegram handles, phone numbers) in `user_ids` when calling `create_people` - it matches them against existing people and returns `possible_duplicates` with the confirmation request. If duplicates are returned, show them to the user and update the existing person instead of creating a new one.
 
         2.  **Understand the Data Schema:**
             *   **Purpose:** Ensure correct data types, required fields, and formatting.
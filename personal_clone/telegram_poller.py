@@ -2,9 +2,11 @@ import asyncio
 import logging
 import os
 import json
+from collections import deque
 
 import httpx
 from google import genai
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.genai import types
 
 from .session_signals import get_pending_refresh
@@ -18,6 +20,26 @@ _pending_session_reset: dict[str, object] = {}  # session_id -> session object
 
 MAX_SESSION_EVENTS = 200
 
+# Per-chat dispatch: agent turns for different chats run in parallel up to
+# MAX_CONCURRENT_CHATS; each chat buffers at most CHAT_QUEUE_SIZE messages.
+MAX_CONCURRENT_CHATS = int(os.environ.get("TELEGRAM_MAX_CONCURRENT_CHATS", "8"))
+CHAT_QUEUE_SIZE = int(os.environ.get("TELEGRAM_CHAT_QUEUE_SIZE", "20"))
+CHAT_WORKER_IDLE_TIMEOUT = 300  # seconds before an idle chat worker exits
+
+OFFSET_FLUSH_INTERVAL = 2.0  # seconds between checkpoint writes for finished updates
+
+# Streaming replies (TELEGRAM_STREAM_REPLIES): minimum seconds between edits
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+STREAM_PLACEHOLDER = "…"
+STREAM_EDIT_INTERVAL = 1.5
+STREAM_EDIT_INTERVAL_GROUP = 3.0
+
+# Webhook mode: shared client/dispatcher plus recently seen update ids, since
+# Telegram redelivers an update when an earlier delivery was not acknowledged.
+_webhook_client: httpx.AsyncClient | None = None
+_webhook_dispatcher: "ChatDispatcher | None" = None
+_seen_update_ids: deque[int] = deque(maxlen=1000)
+
 SESSION_LIMIT_PROMPT = (
     "This conversation has grown very long ({event_count} events) and is "
     "slowing down my responses.\n\n"
@@ -38,8 +60,8 @@ async def send_typing(client: httpx.AsyncClient, token: str, chat_id: int):
         pass
 
 
-async def send_message(client: httpx.AsyncClient, token: str, chat_id: int, text: str):
-    """Send a message to a Telegram chat."""
+async def send_message(client: httpx.AsyncClient, token: str, chat_id: int, text: str) -> int | None:
+    """Send a message to a Telegram chat. Returns the sent message id, if any."""
     url = TELEGRAM_API.format(token=token, method="sendMessage")
     try:
         resp = await client.post(url, json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"})
@@ -47,8 +69,32 @@ async def send_message(client: httpx.AsyncClient, token: str, chat_id: int, text
             resp = await client.post(url, json={"chat_id": chat_id, "text": text})
             if resp.status_code != 200:
                 logger.error("Telegram sendMessage failed: %s", resp.text)
+                return None
+        return resp.json().get("result", {}).get("message_id")
     except Exception:
         logger.exception("Failed to send Telegram message to chat %s", chat_id)
+        return None
+
+
+async def edit_message(
+    client: httpx.AsyncClient,
+    token: str,
+    chat_id: int,
+    message_id: int,
+    text: str,
+    parse_mode: str | None = None,
+) -> dict:
+    """Replace the text of a sent message. Returns Telegram's JSON reply."""
+    url = TELEGRAM_API.format(token=token, method="editMessageText")
+    payload = {"chat_id": chat_id, "message_id": message_id, "text": text}
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
+    try:
+        resp = await client.post(url, json=payload)
+        return resp.json()
+    except Exception:
+        logger.exception("Failed to edit Telegram message in chat %s", chat_id)
+        return {}
 
 
 async def delete_message(client: httpx.AsyncClient, token: str, chat_id: int, message_id: int):
@@ -60,6 +106,99 @@ async def delete_message(client: httpx.AsyncClient, token: str, chat_id: int, me
         pass
 
 
+class StreamingReply:
+    """
+    Streams a growing agent reply into a single Telegram message.
+
+    A placeholder is posted first and then edited as text arrives. ``update``
+    only records the latest text; a background loop pushes it at most once
+    per ``min_interval`` seconds, so bursts of events coalesce into one edit
+    and we stay under Telegram's per-chat edit limits.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, token: str, chat_id: int):
+        self._client = client
+        self._token = token
+        self._chat_id = chat_id
+        # Group chats have much tighter edit limits than private chats
+        self._min_interval = (
+            STREAM_EDIT_INTERVAL_GROUP if chat_id < 0 else STREAM_EDIT_INTERVAL
+        )
+        self._message_id: int | None = None
+        self._latest = ""
+        self._shown = ""
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        self._message_id = await send_message(
+            self._client, self._token, self._chat_id, STREAM_PLACEHOLDER
+        )
+        if self._message_id is not None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def update(self, text: str):
+        self._latest = text
+        self._changed.set()
+
+    async def _flush_loop(self):
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            latest = self._latest
+            if not latest or latest == self._shown:
+                continue
+            text = latest
+            if len(text) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                text = text[: TELEGRAM_MAX_MESSAGE_LENGTH - 1] + "…"
+            # Partial text is sent without parse_mode: half-written markdown
+            # would be rejected by Telegram.
+            result = await edit_message(
+                self._client, self._token, self._chat_id, self._message_id, text
+            )
+            if result.get("ok"):
+                # Not self._latest: chunks that arrived during the edit
+                # haven't been shown yet
+                self._shown = latest
+            delay = result.get("parameters", {}).get("retry_after") or 0
+            await asyncio.sleep(max(delay, self._min_interval))
+
+    async def stop(self):
+        """Stop the background edit loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def finish(self, final_text: str):
+        """Stop streaming and show the final reply exactly like send_message would."""
+        await self.stop()
+        if self._message_id is not None and len(final_text) <= TELEGRAM_MAX_MESSAGE_LENGTH:
+            for parse_mode in ("Markdown", None):
+                if parse_mode is None and final_text == self._shown:
+                    return  # the flush loop already shows it as plain text
+                result = await edit_message(
+                    self._client, self._token, self._chat_id,
+                    self._message_id, final_text, parse_mode,
+                )
+                # "Not modified": the message already reads exactly like this
+                if result.get("ok") or "message is not modified" in str(
+                    result.get("description", "")
+                ):
+                    return
+        if self._message_id is not None:
+            await delete_message(self._client, self._token, self._chat_id, self._message_id)
+        await send_message(self._client, self._token, self._chat_id, final_text)
+
+
+def streaming_enabled() -> bool:
+    """Whether Telegram replies should be streamed via message edits."""
+    return os.environ.get("TELEGRAM_STREAM_REPLIES", "").lower() in ("1", "true", "yes")
+
+
 async def _summarize_session(session) -> str:
     """Use Gemini to summarize session events into a compact context string."""
     texts = []
@@ -130,8 +269,15 @@ async def _handle_session_reset(runner, user_id, session_id, choice: str) -> str
     return await _perform_session_refresh(runner, user_id, session_id, mode, session)
 
 
-async def extract_agent_response(runner, user_id: str, session_id: str, text: str) -> str:
-    """Run the agent and extract the final text response."""
+async def extract_agent_response(
+    runner, user_id: str, session_id: str, text: str, on_text=None
+) -> str:
+    """
+    Run the agent and extract the final text response.
+
+    If ``on_text`` is given, the model output is streamed (SSE) and
+    ``on_text`` is called with the accumulated reply text as events arrive.
+    """
     try:
         session = await runner.session_service.get_session(
             app_name=runner.app_name, user_id=user_id, session_id=session_id
@@ -160,18 +306,30 @@ async def extract_agent_response(runner, user_id: str, session_id: str, text: st
     MAX_RETRIES = 2
     parts = []
     message = types.Content(role="user", parts=[types.Part.from_text(text=text)])
+    run_kwargs = {}
+    if on_text is not None:
+        run_kwargs["run_config"] = RunConfig(streaming_mode=StreamingMode.SSE)
 
     for attempt in range(1 + MAX_RETRIES):
         try:
+            # Partial (streamed) chunks are shown but not kept: the final,
+            # non-partial event of each response repeats the full text.
+            partial = []
             async for event in runner.run_async(
                 user_id=user_id,
                 session_id=session_id,
                 new_message=message,
+                **run_kwargs,
             ):
                 if event.content and event.content.parts:
+                    target = partial if getattr(event, "partial", False) else parts
+                    if target is parts:
+                        partial.clear()
                     for part in event.content.parts:
                         if hasattr(part, "text") and part.text:
-                            parts.append(part.text)
+                            target.append(part.text)
+                    if on_text is not None:
+                        on_text("\n".join(parts + ["".join(partial)]).strip())
             break  # success
         except Exception as exc:
             error_msg = str(exc).split("\n")[0] if str(exc) else type(exc).__name__
@@ -189,6 +347,8 @@ async def extract_agent_response(runner, user_id: str, session_id: str, text: st
 
             if attempt < MAX_RETRIES:
                 parts.clear()
+                if on_text is not None:
+                    on_text("")
                 message = types.Content(
                     role="user",
                     parts=[types.Part.from_text(
@@ -214,15 +374,361 @@ async def extract_agent_response(runner, user_id: str, session_id: str, text: st
     return final_response
 
 
+class ChatDispatcher:
+    """
+    Fans updates out to per-session asyncio worker queues.
+
+    Messages within one session are handled strictly in arrival order, while
+    different sessions run in parallel up to ``max_concurrency`` agent turns.
+    ``submit`` waits when a session's queue is full, which backpressures the
+    caller (the poll loop) instead of buffering without bound.
+    """
+
+    def __init__(
+        self,
+        handler,
+        max_concurrency: int = MAX_CONCURRENT_CHATS,
+        queue_size: int = CHAT_QUEUE_SIZE,
+        idle_timeout: float = CHAT_WORKER_IDLE_TIMEOUT,
+    ):
+        self._handler = handler
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queue_size = queue_size
+        self._idle_timeout = idle_timeout
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+
+    async def submit(self, session_id: str, item) -> None:
+        """Queue an item for a session, starting its worker if needed."""
+        queue = self._queues.get(session_id)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self._queue_size)
+            self._queues[session_id] = queue
+            self._workers[session_id] = asyncio.create_task(
+                self._worker(session_id, queue)
+            )
+        await queue.put(item)
+
+    def try_submit(self, session_id: str, item) -> bool:
+        """Queue an item without waiting. Returns False if the session is full."""
+        queue = self._queues.get(session_id)
+        if queue is not None and queue.full():
+            return False
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self._queue_size)
+            self._queues[session_id] = queue
+            self._workers[session_id] = asyncio.create_task(
+                self._worker(session_id, queue)
+            )
+        queue.put_nowait(item)
+        return True
+
+    async def _worker(self, session_id: str, queue: asyncio.Queue):
+        """Drain one session's queue, exiting after a period of inactivity."""
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), self._idle_timeout)
+                except asyncio.TimeoutError:
+                    if queue.empty():
+                        return
+                    continue
+                try:
+                    async with self._semaphore:
+                        await self._handler(item)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Error handling update for %s", session_id)
+                finally:
+                    queue.task_done()
+        finally:
+            if self._queues.get(session_id) is queue:
+                self._queues.pop(session_id, None)
+                self._workers.pop(session_id, None)
+
+    async def close(self) -> None:
+        """Cancel all session workers and wait for them to exit."""
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queues.clear()
+        self._workers.clear()
+
+
+class OffsetCheckpointer:
+    """
+    Persists the getUpdates offset together with a journal of unfinished updates.
+
+    Telegram drops an update as soon as getUpdates is called with a higher
+    offset, so the offset alone cannot give at-least-once processing while
+    chats are handled concurrently. Instead every batch is journaled before
+    it is confirmed, entries are removed once handled, and whatever is still
+    in the journal on startup is replayed. Writes are atomic (temp file plus
+    ``os.replace``), run off the event loop, and happen once per batch or on
+    a short timer rather than once per update.
+    """
+
+    def __init__(self, path: str, flush_interval: float = OFFSET_FLUSH_INTERVAL):
+        self._path = path
+        self._flush_interval = flush_interval
+        self._pending: dict[int, dict] = {}
+        self._dirty = False
+        self._write_lock = asyncio.Lock()
+        self.offset = 0
+
+    async def load(self) -> list[dict]:
+        """Read the checkpoint. Returns journaled updates to replay, oldest first."""
+        state = await asyncio.to_thread(self._read)
+        self.offset = state.get("offset", 0)
+        self._pending = {u["update_id"]: u for u in state.get("pending", [])}
+        return [self._pending[k] for k in sorted(self._pending)]
+
+    def _read(self) -> dict:
+        try:
+            with open(self._path) as f:
+                raw = f.read().strip()
+        except FileNotFoundError:
+            return {}
+        except OSError:
+            logger.exception("Could not read Telegram offset file")
+            return {}
+        try:
+            state = json.loads(raw)
+        except ValueError:
+            return {}
+        # Older versions stored the bare offset
+        if isinstance(state, int):
+            return {"offset": state}
+        return state if isinstance(state, dict) else {}
+
+    def track(self, offset: int, updates: list[dict]):
+        """Record a fetched batch: the next offset and the updates to be handled."""
+        self.offset = max(self.offset, offset)
+        for update in updates:
+            self._pending[update["update_id"]] = update
+        self._dirty = True
+
+    def done(self, update_id: int):
+        """Mark an update as handled; persisted on the next flush."""
+        if self._pending.pop(update_id, None) is not None:
+            self._dirty = True
+
+    async def flush(self):
+        """Write the checkpoint if anything changed since the last write."""
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            state = {
+                "offset": self.offset,
+                "pending": [self._pending[k] for k in sorted(self._pending)],
+            }
+            try:
+                await asyncio.to_thread(self._write, state)
+            except OSError:
+                self._dirty = True
+                logger.exception("Could not write Telegram offset file")
+
+    def _write(self, state: dict):
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+
+    async def run(self):
+        """Flush periodically so completed updates leave the journal promptly."""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+
+def _session_for_update(update: dict) -> str | None:
+    """Return the session id for a text message update, or None to skip it."""
+    msg = update.get("message")
+    if not msg or not msg.get("text"):
+        return None
+    return f"tg_chat_{msg['chat']['id']}"
+
+
+async def _handle_update(
+    client: httpx.AsyncClient, token: str, update: dict, get_runner_fn, process_init_fn
+):
+    """Run the command/agent pipeline for a single Telegram text message."""
+    msg = update["message"]
+    text = msg["text"]
+    chat_id = msg["chat"]["id"]
+    message_id = msg["message_id"]
+    from_user = msg.get("from", {})
+    user_id = f"tg_{from_user.get('id', 'unknown')}"
+    session_id = f"tg_chat_{chat_id}"
+
+    # SECURE KEY CAPTURE
+    from .secure_config import capture_key, check_pending
+    if check_pending(session_id):
+        result = capture_key(session_id, text)
+        await delete_message(client, token, chat_id, message_id)
+        await send_message(client, token, chat_id, result["message"])
+        return
+
+    # SESSION RESET
+    if session_id in _pending_session_reset:
+        runner = get_runner_fn()
+        if runner:
+            result = await _handle_session_reset(
+                runner, user_id, session_id, text
+            )
+            await send_message(client, token, chat_id, result)
+        else:
+            _pending_session_reset.pop(session_id, None)
+        return
+
+    # Handle /rollback command
+    if text.strip() == "/rollback":
+        trigger_file = os.path.abspath("./data/.rollback_trigger")
+        with open(trigger_file, "w") as f:
+            json.dump({"notify": {"type": "telegram", "chat_id": chat_id}}, f)
+        await send_message(client, token, chat_id, "🔄 **Rollback Triggered**\n\nResetting to previous commit...")
+        return
+
+    # Handle /reset command
+    if text.strip() == "/reset":
+        runner = get_runner_fn()
+        if runner:
+            result = await _perform_session_refresh(runner, user_id, session_id, "fresh")
+            await send_message(client, token, chat_id, f"🧹 **Session Reset**\n{result}")
+        return
+
+    # Handle /init command
+    if text.strip().startswith("/init"):
+        result = process_init_fn(text)
+        await send_message(client, token, chat_id, result)
+        return
+
+    # Handle /start command
+    if text.strip() == "/start":
+        await send_message(client, token, chat_id, "Welcome! Send me a message to get started.")
+        return
+
+    runner = get_runner_fn()
+    if not runner:
+        await send_message(client, token, chat_id, "Bot not ready. Configure at /setup.")
+        return
+
+    # Show typing indicator while the agent processes
+    async def keep_typing():
+        while True:
+            await send_typing(client, token, chat_id)
+            await asyncio.sleep(4)
+
+    typing_task = asyncio.create_task(keep_typing())
+    stream = None
+    if streaming_enabled():
+        stream = StreamingReply(client, token, chat_id)
+        await stream.start()
+    try:
+        response = await extract_agent_response(
+            runner, user_id, session_id, text,
+            on_text=stream.update if stream else None,
+        )
+    finally:
+        typing_task.cancel()
+        try:
+            await typing_task
+        except asyncio.CancelledError:
+            pass
+        if stream:
+            await stream.stop()
+
+    if stream:
+        await stream.finish(response)
+    else:
+        await send_message(client, token, chat_id, response)
+
+
+async def dispatch_webhook_update(update: dict, get_runner_fn, process_init_fn) -> bool:
+    """
+    Hand a webhook update to the same per-chat pipeline the poller uses.
+
+    Returns immediately; False means the chat's queue is full and the update
+    should be rejected so Telegram redelivers it later.
+    """
+    global _webhook_client, _webhook_dispatcher
+
+    update_id = update.get("update_id")
+    if update_id is not None and update_id in _seen_update_ids:
+        return True
+    session_id = _session_for_update(update)
+    if session_id is None:
+        return True
+
+    if _webhook_dispatcher is None:
+        _webhook_client = httpx.AsyncClient(timeout=60)
+
+        async def handle(item):
+            token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+            await _handle_update(
+                _webhook_client, token, item, get_runner_fn, process_init_fn
+            )
+
+        _webhook_dispatcher = ChatDispatcher(handle)
+
+    if not _webhook_dispatcher.try_submit(session_id, update):
+        logger.warning("Telegram: queue full for %s, deferring update", session_id)
+        return False
+    if update_id is not None:
+        _seen_update_ids.append(update_id)
+    return True
+
+
+async def close_webhook_dispatcher():
+    """Stop webhook workers and close the shared HTTP client."""
+    global _webhook_client, _webhook_dispatcher
+    if _webhook_dispatcher is not None:
+        await _webhook_dispatcher.close()
+        _webhook_dispatcher = None
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
+
+
+async def register_webhook(token: str, url: str, secret: str):
+    """Point Telegram at our /telegram/webhook route."""
+    api_url = TELEGRAM_API.format(token=token, method="setWebhook")
+    async with httpx.AsyncClient(timeout=10) as client:
+        try:
+            resp = await client.post(
+                api_url,
+                json={
+                    "url": url,
+                    "secret_token": secret,
+                    "allowed_updates": ["message"],
+                },
+            )
+            if resp.status_code != 200:
+                logger.error("Telegram setWebhook failed: %s", resp.text)
+            else:
+                logger.info("Telegram: Webhook registered at %s", url)
+        except Exception:
+            logger.exception("Failed to register Telegram webhook")
+
+
 async def poll_telegram(get_runner_fn, process_init_fn):
-    """Long-poll Telegram's getUpdates API and process messages."""
+    """Long-poll Telegram's getUpdates API and dispatch messages per chat."""
     token = os.environ.get("TELEGRAM_BOT_TOKEN")
     if not token or token == "********":
         logger.info("Telegram: No valid token, poller idle.")
         return
 
-    if os.environ.get("TELEGRAM_WEBHOOK_SECRET"):
+    webhook_secret = os.environ.get("TELEGRAM_WEBHOOK_SECRET")
+    if webhook_secret:
         logger.info("Telegram: Webhook mode active (polling disabled).")
+        webhook_url = os.environ.get("TELEGRAM_WEBHOOK_URL")
+        if webhook_url:
+            await register_webhook(token, webhook_url, webhook_secret)
         return
 
     # Delete existing webhook to ensure polling works
@@ -234,120 +740,78 @@ async def poll_telegram(get_runner_fn, process_init_fn):
             pass
 
     logger.info("Telegram: Polling mode active — listening for messages...")
-    offset_file = os.path.join(os.path.abspath("./data"), ".tg_poll_offset")
-    offset = 0
-    try:
-        with open(offset_file) as f:
-            offset = int(f.read().strip())
-            logger.info("Resumed Telegram poll offset: %d", offset)
-    except (FileNotFoundError, ValueError):
-        pass
+    checkpointer = OffsetCheckpointer(
+        os.path.join(os.path.abspath("./data"), ".tg_poll_offset")
+    )
+    replay = await checkpointer.load()
+    if checkpointer.offset:
+        logger.info("Resumed Telegram poll offset: %d", checkpointer.offset)
 
     async with httpx.AsyncClient(timeout=60) as client:
-        while True:
-            try:
-                url = TELEGRAM_API.format(token=token, method="getUpdates")
-                resp = await client.get(url, params={"offset": offset, "timeout": 30})
-                data = resp.json()
-
-                if not data.get("ok"):
-                    logger.warning("Telegram getUpdates returned error: %s", data)
-                    await asyncio.sleep(5)
-                    continue
-
-                for update in data.get("result", []):
-                    offset = update["update_id"] + 1
-                    try:
-                        with open(offset_file, "w") as f:
-                            f.write(str(offset))
-                    except OSError:
-                        pass
-                    msg = update.get("message")
-                    if not msg or not msg.get("text"):
-                        continue
-
-                    text = msg["text"]
-                    chat_id = msg["chat"]["id"]
-                    message_id = msg["message_id"]
-                    from_user = msg.get("from", {})
-                    user_id = f"tg_{from_user.get('id', 'unknown')}"
-                    session_id = f"tg_chat_{chat_id}"
-
-                    # SECURE KEY CAPTURE
-                    from .secure_config import capture_key, check_pending
-                    if check_pending(session_id):
-                        result = capture_key(session_id, text)
-                        await delete_message(client, token, chat_id, message_id)
-                        await send_message(client, token, chat_id, result["message"])
-                        continue
-
-                    # SESSION RESET
-                    if session_id in _pending_session_reset:
-                        runner = get_runner_fn()
-                        if runner:
-                            result = await _handle_session_reset(
-                                runner, user_id, session_id, text
-                            )
-                            await send_message(client, token, chat_id, result)
-                        else:
-                            _pending_session_reset.pop(session_id, None)
-                        continue
-
-                    # Handle /rollback command
-                    if text.strip() == "/rollback":
-                        trigger_file = os.path.abspath("./data/.rollback_trigger")
-                        with open(trigger_file, "w") as f:
-                            json.dump({"notify": {"type": "telegram", "chat_id": chat_id}}, f)
-                        await send_message(client, token, chat_id, "🔄 **Rollback Triggered**\n\nResetting to previous commit...")
-                        continue
 
-                    # Handle /reset command
-                    if text.strip() == "/reset":
-                        runner = get_runner_fn()
-                        if runner:
-                            result = await _perform_session_refresh(runner, user_id, session_id, "fresh")
-                            await send_message(client, token, chat_id, f"🧹 **Session Reset**\n{result}")
-                        continue
-
-                    # Handle /init command
-                    if text.strip().startswith("/init"):
-                        result = process_init_fn(text)
-                        await send_message(client, token, chat_id, result)
-                        continue
+        async def handle(update):
+            try:
+                await _handle_update(client, token, update, get_runner_fn, process_init_fn)
+            except asyncio.CancelledError:
+                raise  # left in the journal, replayed after restart
+            except Exception:
+                logger.exception("Error handling Telegram update %s", update.get("update_id"))
+            checkpointer.done(update["update_id"])
 
-                    # Handle /start command
-                    if text.strip() == "/start":
-                        await send_message(client, token, chat_id, "Welcome! Send me a message to get started.")
+        dispatcher = ChatDispatcher(handle)
+        flush_task = asyncio.create_task(checkpointer.run())
+        try:
+            if replay:
+                logger.info("Replaying %d unfinished Telegram updates", len(replay))
+            for update in replay:
+                await dispatcher.submit(_session_for_update(update), update)
+
+            while True:
+                try:
+                    url = TELEGRAM_API.format(token=token, method="getUpdates")
+                    resp = await client.get(
+                        url, params={"offset": checkpointer.offset, "timeout": 30}
+                    )
+                    data = resp.json()
+
+                    if not data.get("ok"):
+                        logger.warning("Telegram getUpdates returned error: %s", data)
+                        await asyncio.sleep(5)
                         continue
 
-                    runner = get_runner_fn()
-                    if not runner:
-                        await send_message(client, token, chat_id, "Bot not ready. Configure at /setup.")
+                    updates = data.get("result", [])
+                    if not updates:
                         continue
 
-                    # Show typing indicator while the agent processes
-                    async def keep_typing(_chat_id=chat_id):
-                        while True:
-                            await send_typing(client, token, _chat_id)
-                            await asyncio.sleep(4)
-
-                    typing_task = asyncio.create_task(keep_typing())
-                    try:
-                        response = await extract_agent_response(runner, user_id, session_id, text)
-                    finally:
-                        typing_task.cancel()
-                        try:
-                            await typing_task
-                        except asyncio.CancelledError:
-                            pass
-
-                    await send_message(client, token, chat_id, response)
-
-            except httpx.ReadTimeout:
-                continue
+                    # Journal the batch before the next getUpdates call
+                    # confirms it to Telegram, so a crash replays it instead
+                    # of losing it.
+                    batch = []
+                    for update in updates:
+                        session_id = _session_for_update(update)
+                        if session_id is not None:
+                            batch.append((session_id, update))
+                    checkpointer.track(
+                        updates[-1]["update_id"] + 1, [u for _, u in batch]
+                    )
+                    await checkpointer.flush()
+
+                    for session_id, update in batch:
+                        await dispatcher.submit(session_id, update)
+
+                except httpx.ReadTimeout:
+                    continue
+                except asyncio.CancelledError:
+                    logger.info("Telegram poller shutting down")
+                    return
+                except Exception:
+                    logger.exception("Telegram poller error, retrying in 5s")
+                    await asyncio.sleep(5)
+        finally:
+            await dispatcher.close()
+            flush_task.cancel()
+            try:
+                await flush_task
             except asyncio.CancelledError:
-                logger.info("Telegram poller shutting down")
-                return
-            except Exception:
-                logger.exception("Telegram poller error, retrying in 5s")
-                await asyncio.sleep(5)
+                pass
+            await checkpointer.flush()
@@ -0,0 +1,388 @@
+"""
+Local SQLite mirror of ClickUp tasks.
+
+The mirror starts with a bulk sync of each team's tasks and is then kept
+current in two ways:
+- the ``/clickup/webhook`` route applies task events as they arrive;
+- a scheduler job re-reads everything updated since the last sync
+  (``date_updated_gt``), which catches any missed webhook deliveries;
+- once the last full sync of a team is a day old, that job reads everything
+  instead, dropping tasks that were deleted or archived while a webhook
+  delivery was missed, which the incremental sync cannot see. The time of the
+  last full sync is stored with the team, so restarts don't postpone it.
+
+``list_tasks_for_user`` and ``get_task`` answer from the indexed local tables
+once a team has been synced, and fall back to the API until then.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+import aiosqlite
+from apscheduler.jobstores.base import JobLookupError
+
+from .. import config
+from .clickup_tools import clickup_client, iter_task_pages, topology
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_INTERVAL_MINUTES = 15
+RECONCILE_OVERLAP_MS = 5 * 60 * 1000  # re-read a little before the last sync
+RECONCILE_JOB_ID = "clickup_mirror_reconcile"
+FULL_SYNC_INTERVAL_MS = 24 * 3600 * 1000
+FULL_SYNC_JOB_ID = "clickup_mirror_full_sync"  # no longer scheduled, see below
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    team_id TEXT NOT NULL,
+    list_id TEXT,
+    folder_id TEXT,
+    name TEXT,
+    text_content TEXT,
+    description TEXT,
+    status TEXT,
+    status_type TEXT,
+    date_created INTEGER,
+    date_updated INTEGER,
+    due_date INTEGER,
+    creator TEXT,
+    assignees TEXT,
+    url TEXT,
+    archived INTEGER NOT NULL DEFAULT 0,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_team_status ON tasks (team_id, status_type);
+CREATE INDEX IF NOT EXISTS tasks_team_due ON tasks (team_id, due_date);
+CREATE INDEX IF NOT EXISTS tasks_list ON tasks (list_id);
+CREATE INDEX IF NOT EXISTS tasks_folder ON tasks (folder_id);
+CREATE TABLE IF NOT EXISTS task_assignees (
+    task_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    PRIMARY KEY (task_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS task_assignees_user ON task_assignees (user_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    team_id TEXT PRIMARY KEY,
+    synced_until INTEGER NOT NULL,
+    full_synced_at INTEGER
+);
+"""
+
+_db: aiosqlite.Connection | None = None
+_db_lock: asyncio.Lock | None = None
+_synced_teams: set[str] = set()
+_team_locks: dict[str, asyncio.Lock] = {}
+_webhook_tasks: set[asyncio.Task] = set()
+
+
+def enabled() -> bool:
+    return config.CLICKUP_TASK_MIRROR
+
+
+def _ms(value) -> int | None:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def _get_db() -> aiosqlite.Connection:
+    global _db, _db_lock
+    if _db is not None:
+        return _db
+    if _db_lock is None:
+        _db_lock = asyncio.Lock()
+    async with _db_lock:
+        if _db is None:
+            os.makedirs(os.path.dirname(config.CLICKUP_MIRROR_DB) or ".", exist_ok=True)
+            db = await aiosqlite.connect(config.CLICKUP_MIRROR_DB)
+            db.row_factory = aiosqlite.Row
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.executescript(SCHEMA)
+            async with db.execute("PRAGMA table_info(sync_state)") as cursor:
+                columns = {row["name"] async for row in cursor}
+            if "full_synced_at" not in columns:
+                await db.execute("ALTER TABLE sync_state ADD COLUMN full_synced_at INTEGER")
+            async with db.execute("SELECT team_id FROM sync_state") as cursor:
+                _synced_teams.update(row["team_id"] async for row in cursor)
+            await db.commit()
+            _db = db
+    return _db
+
+
+async def close_mirror():
+    """Close the database connection; called on app shutdown."""
+    global _db
+    db, _db = _db, None
+    if db is not None:
+        await db.close()
+
+
+async def _upsert_tasks(db: aiosqlite.Connection, team_id: str, tasks: list[dict]):
+    rows, assignees = [], []
+    for task in tasks:
+        rows.append(
+            (
+                task["id"],
+                str(team_id),
+                str((task.get("list") or {}).get("id") or ""),
+                str((task.get("folder") or {}).get("id") or ""),
+                task.get("name"),
+                task.get("text_content"),
+                task.get("description"),
+                (task.get("status") or {}).get("status", ""),
+                (task.get("status") or {}).get("type", ""),
+                _ms(task.get("date_created")),
+                _ms(task.get("date_updated")),
+                _ms(task.get("due_date")),
+                json.dumps(task.get("creator")),
+                json.dumps(task.get("assignees", [])),
+                task.get("url"),
+                int(bool(task.get("archived"))),
+                json.dumps(task),
+            )
+        )
+        assignees.extend(
+            (task["id"], str(x["id"])) for x in task.get("assignees", []) if x.get("id")
+        )
+    await db.executemany(
+        "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    await db.executemany(
+        "DELETE FROM task_assignees WHERE task_id = ?", [(row[0],) for row in rows]
+    )
+    await db.executemany(
+        "INSERT OR IGNORE INTO task_assignees VALUES (?, ?)", assignees
+    )
+
+
+async def sync_team(team_id: str, full: bool = False) -> int:
+    """
+    Pull tasks of a team into the mirror.
+
+    A full sync (the first one, ``full=True``, or once the last full sync is
+    older than FULL_SYNC_INTERVAL_MS) reads every task and removes mirrored
+    tasks that are no longer returned (deleted or archived); other syncs only
+    read tasks updated since the previous one. Returns the number of tasks
+    stored.
+    """
+    team_id = str(team_id)
+    lock = _team_locks.setdefault(team_id, asyncio.Lock())
+    async with lock:
+        db = await _get_db()
+        started_at = int(time.time() * 1000)
+        params = {
+            "archived": "false",
+            "subtasks": "true",
+            "include_closed": "true",
+            "order_by": "updated",
+        }
+        async with db.execute(
+            "SELECT synced_until, full_synced_at FROM sync_state WHERE team_id = ?",
+            (team_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+        full = (
+            full
+            or row is None
+            or row["full_synced_at"] is None
+            or started_at - row["full_synced_at"] > FULL_SYNC_INTERVAL_MS
+        )
+        if not full:
+            params["date_updated_gt"] = row["synced_until"] - RECONCILE_OVERLAP_MS
+
+        stored, seen = 0, set()
+        async for tasks_page in iter_task_pages(f"/team/{team_id}/task", params):
+            await _upsert_tasks(db, team_id, tasks_page)
+            await db.commit()
+            stored += len(tasks_page)
+            seen.update(task["id"] for task in tasks_page)
+
+        if full:
+            # Only tasks untouched since the sync started: anything newer came
+            # from a webhook while we were paging
+            async with db.execute(
+                "SELECT id FROM tasks WHERE team_id = ? AND (date_updated IS NULL OR date_updated < ?)",
+                (team_id, started_at),
+            ) as cursor:
+                gone = [(row["id"],) async for row in cursor if row["id"] not in seen]
+            await db.executemany("DELETE FROM tasks WHERE id = ?", gone)
+            await db.executemany("DELETE FROM task_assignees WHERE task_id = ?", gone)
+            if gone:
+                logger.info("ClickUp mirror dropped %d gone tasks of team %s", len(gone), team_id)
+
+        await db.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+            (team_id, started_at, started_at if full else row["full_synced_at"]),
+        )
+        await db.commit()
+        _synced_teams.add(team_id)
+        logger.info(
+            "ClickUp mirror synced team %s%s: %d tasks",
+            team_id, " (full)" if full else "", stored,
+        )
+        return stored
+
+
+async def _team_ids() -> list[str]:
+    if config.CLICKUP_TEAM_ID:
+        return [str(config.CLICKUP_TEAM_ID)]
+    workspace = await topology.get()
+    return [str(team["id"]) for team in workspace.teams]
+
+
+async def reconcile_job(full: bool = False):
+    """
+    Scheduler entry point: sync of every team, full when forced or when the
+    team's last full sync is due.
+    """
+    if not enabled():
+        return
+    for team_id in await _team_ids():
+        try:
+            await sync_team(team_id, full=full)
+        except Exception:
+            logger.exception("ClickUp mirror reconciliation of team %s failed", team_id)
+
+
+def schedule_reconciliation(scheduler):
+    """
+    Register the reconciliation job (idempotent across restarts). It runs
+    right away, which performs the initial bulk sync on a fresh database.
+    """
+    scheduler.add_job(
+        "personal_clone.tools.clickup_mirror:reconcile_job",
+        "interval",
+        minutes=RECONCILE_INTERVAL_MINUTES,
+        id=RECONCILE_JOB_ID,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=datetime.now(),
+    )
+    # Full syncs used to be a separate interval job, which replace_existing
+    # pushed back a whole interval on every restart; the persistent job store
+    # may still hold it
+    try:
+        scheduler.remove_job(FULL_SYNC_JOB_ID)
+    except JobLookupError:
+        pass
+
+
+def ready(team_id: str) -> bool:
+    return enabled() and str(team_id) in _synced_teams
+
+
+# --- webhook ---
+
+
+async def _apply_event(event: dict):
+    task_id = event.get("task_id")
+    if not task_id:
+        if str(event.get("event", "")).startswith(("list", "folder", "space")):
+            topology.invalidate()
+        return
+    db = await _get_db()
+    if event.get("event") == "taskDeleted":
+        await db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        await db.execute("DELETE FROM task_assignees WHERE task_id = ?", (task_id,))
+        await db.commit()
+        return
+    # Events only carry the change history; fetch the task as it is now
+    task = await clickup_client.get(f"/task/{task_id}")
+    team_id = task.get("team_id") or (await _team_ids() or [""])[0]
+    await _upsert_tasks(db, team_id, [task])
+    await db.commit()
+
+
+async def _apply_event_logged(event: dict):
+    try:
+        await _apply_event(event)
+    except Exception:
+        logger.exception("Failed to apply ClickUp webhook event %s", event.get("event"))
+
+
+def handle_webhook_event(event: dict):
+    """Apply a webhook event in the background so the route returns at once."""
+    if not enabled():
+        return
+    task = asyncio.create_task(_apply_event_logged(event))
+    _webhook_tasks.add(task)
+    task.add_done_callback(_webhook_tasks.discard)
+
+
+# --- queries ---
+
+
+def _row_to_task(row) -> dict:
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "text_content": row["text_content"],
+        "description": row["description"],
+        "status": row["status"],
+        "status_type": row["status_type"],
+        "date_created": str(row["date_created"]) if row["date_created"] else None,
+        "creator": json.loads(row["creator"]) if row["creator"] else None,
+        "assignees": json.loads(row["assignees"]) if row["assignees"] else [],
+        "due_date": str(row["due_date"]) if row["due_date"] else None,
+        "url": row["url"],
+    }
+
+
+async def query_tasks(
+    team_id: str,
+    assignee_id: str,
+    list_id: str | None = None,
+    folder_id: str | None = None,
+    status: str | None = None,
+    due_after: int | None = None,
+    due_before: int | None = None,
+) -> list[dict]:
+    """Tasks assigned to a member, filtered like `list_tasks_for_user`."""
+    db = await _get_db()
+    sql = [
+        "SELECT t.* FROM tasks t JOIN task_assignees a ON a.task_id = t.id",
+        "WHERE a.user_id = ? AND t.team_id = ? AND t.archived = 0",
+    ]
+    args: list = [str(assignee_id), str(team_id)]
+    if list_id:
+        sql.append("AND t.list_id = ?")
+        args.append(str(list_id))
+    if folder_id:
+        sql.append("AND t.folder_id = ?")
+        args.append(str(folder_id))
+    status_lower = status.lower() if status else None
+    if status_lower == "open":
+        sql.append("AND t.status_type IN ('open', 'custom')")
+    elif status_lower == "closed":
+        sql.append("AND t.status_type = 'done'")
+    elif status:
+        sql.append("AND lower(t.status) = ?")
+        args.append(status_lower)
+    else:
+        # Same default as the API: closed tasks are not included
+        sql.append("AND t.status_type != 'closed'")
+    if due_after:
+        sql.append("AND t.due_date > ?")
+        args.append(due_after)
+    if due_before:
+        sql.append("AND t.due_date < ?")
+        args.append(due_before)
+    sql.append("ORDER BY t.date_updated DESC")
+    async with db.execute(" ".join(sql), args) as cursor:
+        return [_row_to_task(row) async for row in cursor]
+
+
+async def get_task(task_id: str) -> dict | None:
+    """The mirrored task object as ClickUp returned it, or None if not mirrored."""
+    db = await _get_db()
+    async with db.execute("SELECT raw FROM tasks WHERE id = ?", (task_id,)) as cursor:
+        row = await cursor.fetchone()
+    return json.loads(row["raw"]) if row and row["raw"] else None
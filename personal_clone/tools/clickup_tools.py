@@ -1,3 +1,7 @@
+import asyncio
+import json
+import logging
+import time
 from datetime import datetime, timedelta, timezone
 
 # from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
@@ -5,15 +9,223 @@ from datetime import datetime, timedelta, timezone
 # from mcp import StdioServerParameters
 from typing import Any
 
-import requests
+import httpx
 from google.adk.tools.tool_context import ToolContext
 
 from .. import config
 
+logger = logging.getLogger(__name__)
+
 API_BASE_URL = "https://api.clickup.com/api/v2"
 
 HEADERS = {"Authorization": config.CLICKUP_API_TOKEN}
 
+CLICKUP_MAX_CONNECTIONS = 10
+CLICKUP_MAX_CONCURRENCY = 8  # requests in flight at once
+CLICKUP_MAX_RETRIES = 3  # retries after a 429
+CLICKUP_MAX_RATE_LIMIT_WAIT = 60  # seconds
+CLICKUP_TIMEOUT = 30  # seconds
+
+
+class ClickUpClient:
+    """
+    Shared async ClickUp API client.
+
+    Keeps one pooled keep-alive ``httpx.AsyncClient`` for all tools, caps the
+    number of requests in flight and follows ClickUp's rate-limit headers:
+    once ``X-RateLimit-Remaining`` hits zero, requests wait until
+    ``X-RateLimit-Reset``; a 429 is retried after the reset time.
+    """
+
+    def __init__(self, headers: dict, max_concurrency: int = CLICKUP_MAX_CONCURRENCY):
+        self._headers = headers
+        self._max_concurrency = max_concurrency
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._remaining: int | None = None
+        self._reset_at = 0.0  # epoch seconds
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=API_BASE_URL,
+                headers=self._headers,
+                timeout=CLICKUP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=CLICKUP_MAX_CONNECTIONS,
+                    max_keepalive_connections=CLICKUP_MAX_CONNECTIONS,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._client
+
+    def _note_rate_limit(self, response: httpx.Response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        try:
+            if remaining is not None:
+                self._remaining = int(remaining)
+            if reset is not None:
+                self._reset_at = float(reset)
+        except ValueError:
+            pass
+
+    def _rate_limit_delay(self) -> float:
+        if self._remaining is None or self._remaining > 0:
+            return 0.0
+        return min(max(self._reset_at - time.time(), 0.0), CLICKUP_MAX_RATE_LIMIT_WAIT)
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send a request and return the decoded JSON body."""
+        client = self._get_client()
+        for attempt in range(CLICKUP_MAX_RETRIES + 1):
+            async with self._semaphore:
+                delay = self._rate_limit_delay()
+                if delay:
+                    logger.info("ClickUp rate limit reached, waiting %.1fs", delay)
+                    await asyncio.sleep(delay)
+                    self._remaining = None
+                resp = await client.request(method, path, **kwargs)
+                self._note_rate_limit(resp)
+            if resp.status_code == 429 and attempt < CLICKUP_MAX_RETRIES:
+                self._remaining = 0
+                if self._reset_at <= time.time():
+                    self._reset_at = time.time() + 2**attempt
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    async def get(self, path: str, params: dict | None = None) -> Any:
+        return await self.request("GET", path, params=params)
+
+    async def post(self, path: str, json: dict) -> Any:
+        return await self.request("POST", path, json=json)
+
+    async def put(self, path: str, json: dict) -> Any:
+        return await self.request("PUT", path, json=json)
+
+    async def close(self):
+        """Close pooled connections; called on app shutdown."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+clickup_client = ClickUpClient(HEADERS)
+
+
+async def close_clickup_client():
+    await clickup_client.close()
+
+
+TOPOLOGY_TTL = 900  # seconds before the workspace topology is refreshed
+
+
+class WorkspaceTopology:
+    """
+    Cached snapshot of the ClickUp workspace: teams, members, spaces (with
+    statuses), folders and lists.
+
+    Loaded with one ``/team`` call followed by concurrent space, folder and
+    list requests, indexed by member email and id, and refreshed in the
+    background once older than ``TOPOLOGY_TTL``; callers keep using the
+    previous snapshot while the refresh runs.
+    """
+
+    def __init__(self, ttl: float = TOPOLOGY_TTL):
+        self._ttl = ttl
+        self._loaded_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self.teams: list[dict] = []  # {"id", "name", "members"}
+        self.spaces: dict[str, list[dict]] = {}  # team id -> spaces
+        self.space_contents: dict[str, dict] = {}  # space id -> folders/lists
+        self.members_by_email: dict[str, dict] = {}
+        self.members_by_id: dict[str, dict] = {}
+
+    async def _load(self):
+        teams_data = await clickup_client.get("/team")
+        teams = []
+        members_by_email, members_by_id = {}, {}
+        for team in teams_data.get("teams", []):
+            members = [
+                {
+                    "id": x["user"]["id"],
+                    "username": x["user"]["username"],
+                    "email": x["user"]["email"],
+                }
+                for x in team.get("members", [])
+            ]
+            for member in members:
+                if member["email"]:
+                    members_by_email.setdefault(member["email"].lower(), member)
+                members_by_id.setdefault(str(member["id"]), member)
+            teams.append({"id": team["id"], "name": team["name"], "members": members})
+
+        space_responses = await asyncio.gather(
+            *(clickup_client.get(f"/team/{team['id']}/space") for team in teams)
+        )
+        spaces = {
+            team["id"]: [
+                {"id": x["id"], "name": x["name"], "statuses": x["statuses"]}
+                for x in response.get("spaces", [])
+            ]
+            for team, response in zip(teams, space_responses)
+        }
+        space_ids = [space["id"] for team_spaces in spaces.values() for space in team_spaces]
+        contents = await asyncio.gather(
+            *(self._load_space_contents(space_id) for space_id in space_ids)
+        )
+
+        self.teams = teams
+        self.spaces = spaces
+        self.space_contents = dict(zip(space_ids, contents))
+        self.members_by_email = members_by_email
+        self.members_by_id = members_by_id
+        self._loaded_at = time.monotonic()
+
+    @staticmethod
+    async def _load_space_contents(space_id: str) -> dict:
+        folders, lists = await asyncio.gather(
+            clickup_client.get(f"/space/{space_id}/folder"),
+            clickup_client.get(f"/space/{space_id}/list"),
+        )
+        return {"folders": folders.get("folders", []), "lists": lists.get("lists", [])}
+
+    async def _refresh_logged(self):
+        try:
+            await self._load()
+        except Exception:
+            logger.exception("ClickUp topology refresh failed")
+
+    async def get(self) -> "WorkspaceTopology":
+        """Return the topology, loading it on first use."""
+        if self._loaded_at is None:
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._load())
+            # Shielded so one cancelled caller doesn't abort the shared load
+            await asyncio.shield(self._task)
+        elif time.monotonic() - self._loaded_at > self._ttl and (
+            self._task is None or self._task.done()
+        ):
+            self._task = asyncio.create_task(self._refresh_logged())
+        return self
+
+    def invalidate(self):
+        """Refresh on next use (e.g. after a member or space was not found)."""
+        if self._loaded_at is not None:
+            self._loaded_at = 0.0
+
+    def user_info(self, email: str) -> dict:
+        """The `clickup_user_info` shape returned by `get_clickup_user`."""
+        return {
+            "user_email": email,
+            "user_teams": [dict(team) for team in self.teams],
+            "user_spaces": [self.spaces.get(team["id"], []) for team in self.teams],
+        }
+
+
+topology = WorkspaceTopology()
+
 
 def create_timestamp_ms_from_local(
     year: int, month: int, day: int, hour: int, minute: int, utc_offset_hours: int
@@ -45,7 +257,7 @@ def create_timestamp_ms_from_local(
     return int(utc_dt.timestamp() * 1000)
 
 
-def get_clickup_user(tool_context: ToolContext):
+async def get_clickup_user(tool_context: ToolContext):
     """
     Retrieve a ClickUp user object information.
     Use this tool as a starting point to get the user's teams and spaces.
@@ -58,37 +270,11 @@ def get_clickup_user(tool_context: ToolContext):
             - 'user_spaces': A list of spaces the user has access to, each with its statuses.
 
     """
-    url = f"{API_BASE_URL}/team"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-
     email = tool_context.state.get("user_id", "")
 
-    user_info = {"user_email": email, "user_teams": [], "user_spaces": []}
-
     try:
-        teams = resp.json().get("teams", [])
-        for team in teams:
-            team_info = {"id": team["id"], "name": team["name"]}
-            member_info = [
-                {
-                    "id": x["user"]["id"],
-                    "username": x["user"]["username"],
-                    "email": x["user"]["email"],
-                }
-                for x in team.get("members", [])
-            ]
-            team_info["members"] = member_info
-            user_info["user_teams"].append(team_info)
-            space_url = f"{API_BASE_URL}/team/{team['id']}/space"
-            space_response = requests.get(space_url, headers=HEADERS)
-            space_response.raise_for_status()
-            spaces = space_response.json().get("spaces", [])
-            spaces_dict = [
-                {"id": x["id"], "name": x["name"], "statuses": x["statuses"]}
-                for x in spaces
-            ]
-            user_info["user_spaces"].append(spaces_dict)
+        workspace = await topology.get()
+        user_info = workspace.user_info(email)
         tool_context.state["clickup_user_info"] = user_info
         return user_info
 
@@ -96,26 +282,19 @@ def get_clickup_user(tool_context: ToolContext):
         return {"status": "error", "message": str(e)}
 
 
-def get_clickup_user_by_email(email: str):
+async def get_clickup_user_by_email(email: str):
     """
     Retrieve a ClickUp user object.
 
     """
-    url = f"{API_BASE_URL}/team"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-
     try:
-        teams = resp.json().get("teams", [])
-        for team in teams:
-            for member in team.get("members", []):
-                if member.get("user", {}).get("email") == email:
-                    return member.get("user")
+        workspace = await topology.get()
+        return workspace.members_by_email.get(email.lower())
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-def list_folders_and_lists(space_id: str):
+async def list_folders_and_lists(space_id: str):
     """
     List folders and lists for a given space.
 
@@ -125,22 +304,71 @@ def list_folders_and_lists(space_id: str):
     Returns:
         dict[List[dict[str, Any]]]: A list of folder objects and lists objects under the space.
     """
-    result = {}
-    folder_url = f"{API_BASE_URL}/space/{space_id}/folder"
-    list_url = f"{API_BASE_URL}/space/{space_id}/list"
     try:
-        resp = requests.get(folder_url, headers=HEADERS)
-        resp.raise_for_status()
-        result["folders"] = resp.json().get("folders", [])
-        resp = requests.get(list_url, headers=HEADERS)
-        resp.raise_for_status()
-        result["lists"] = resp.json().get("lists", [])
+        workspace = await topology.get()
+        result = workspace.space_contents.get(str(space_id))
+        if result is None:
+            # A space created since the last refresh
+            result = await WorkspaceTopology._load_space_contents(space_id)
+            topology.invalidate()
         return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-def list_tasks_for_user(
+TASK_PAGE_CONCURRENCY = 3  # pages requested ahead once a listing has more than one
+
+
+async def iter_task_pages(path: str, params: dict, concurrency: int = TASK_PAGE_CONCURRENCY):
+    """
+    Yields pages of raw tasks in order.
+
+    The first page is fetched alone (most listings fit in one); after that up
+    to ``concurrency`` pages are requested ahead, and requests past the
+    ``last_page`` are cancelled.
+    """
+
+    async def fetch(page: int) -> dict:
+        return await clickup_client.get(path, params={**params, "page": page})
+
+    inflight: dict[int, asyncio.Task] = {}
+    next_page = current = 0
+    try:
+        while True:
+            window = 1 if current == 0 else concurrency
+            while len(inflight) < window:
+                inflight[next_page] = asyncio.create_task(fetch(next_page))
+                next_page += 1
+            data = await inflight.pop(current)
+            tasks_page = data.get("tasks", [])
+            if tasks_page:
+                yield tasks_page
+            if data.get("last_page", False) or not tasks_page:
+                return
+            current += 1
+    finally:
+        for task in inflight.values():
+            task.cancel()
+
+
+def _project_task(x: dict) -> dict:
+    """Keep only the task fields the tools return."""
+    return {
+        "id": x.get("id"),
+        "name": x.get("name"),
+        "text_content": x.get("text_content"),
+        "description": x.get("description"),
+        "status": x.get("status", {}).get("status", ""),
+        "status_type": x.get("status", {}).get("type", ""),
+        "date_created": x.get("date_created"),
+        "creator": x.get("creator"),
+        "assignees": x.get("assignees", []),
+        "due_date": x.get("due_date"),
+        "url": x.get("url"),
+    }
+
+
+async def list_tasks_for_user(
     tool_context: ToolContext,
     team_id: str,
     list_id: str | None = None,
@@ -168,7 +396,7 @@ def list_tasks_for_user(
 
     Raises:
         ValueError: If the user or team cannot be found in ClickUp.
-        requests.HTTPError: If the ClickUp API returns an error response.
+        httpx.HTTPStatusError: If the ClickUp API returns an error response.
     """
     email = tool_context.state.get("user_id", "")
     if not email:
@@ -177,24 +405,28 @@ def list_tasks_for_user(
             "error": "ToolContext.state['user_id'] is missing (expected user email).",
         }
 
-    user_info = get_clickup_user(tool_context)
-    if not user_info or "user_teams" not in user_info:
+    try:
+        workspace = await topology.get()
+    except Exception:
         return {
             "status": "failed",
             "error": "Could not retrieve user/team info from ClickUp.",
         }
+    tool_context.state["clickup_user_info"] = workspace.user_info(email)
 
     # Locate the team
-    target_team = next((t for t in user_info["user_teams"] if t["id"] == team_id), None)  # type: ignore
+    target_team = next((t for t in workspace.teams if t["id"] == team_id), None)
     if not target_team:
+        topology.invalidate()
         return {
             "status": "failed",
             "error": f"Team with ID {team_id} not found for this user.",
         }
 
     # Locate the user in that team
-    member = next((m for m in target_team["members"] if m["email"] == email), None)  # type: ignore
+    member = next((m for m in target_team["members"] if m["email"] == email), None)
     if not member:
+        topology.invalidate()
         return {
             "status": "failed",
             "error": f"User {email} is not a member of team {team_id}.",
@@ -264,55 +496,47 @@ def list_tasks_for_user(
 
     # --- Endpoint selection ---
     if list_id:
-        url = f"{API_BASE_URL}/list/{list_id}/task"
+        url = f"/list/{list_id}/task"
     elif folder_id:
-        url = f"{API_BASE_URL}/folder/{folder_id}/task"
+        url = f"/folder/{folder_id}/task"
     else:
-        url = f"{API_BASE_URL}/team/{team_id}/task"
-
-    all_tasks = []
-    page = 0
-    while True:
-        params["page"] = page
-        resp = requests.get(url, headers=HEADERS, params=params)
-        resp.raise_for_status()
-        data = resp.json()
-        tasks_page = data.get("tasks", [])
-        all_tasks.extend(tasks_page)
-
-        if data.get("last_page", False) or not tasks_page:
-            break
-        page += 1
-
-    clean_tasks = [
-        {
-            "id": x.get("id"),
-            "name": x.get("name"),
-            "text_content": x.get("text_content"),
-            "description": x.get("description"),
-            "status": x.get("status", {}).get("status", ""),
-            "status_type": x.get("status", {}).get("type", ""),
-            "date_created": x.get("date_created"),
-            "creator": x.get("creator"),
-            "assignees": x.get("assignees", []),
-            "due_date": x.get("due_date"),
-            "url": x.get("url"),
-        }
-        for x in all_tasks
-    ]
+        url = f"/team/{team_id}/task"
+
+    if config.CLICKUP_TASK_MIRROR:
+        from . import clickup_mirror
+
+        if clickup_mirror.ready(team_id):
+            try:
+                return await clickup_mirror.query_tasks(
+                    team_id,
+                    str(user_id),
+                    list_id=list_id,
+                    folder_id=folder_id,
+                    status=status,
+                    due_after=start_ts,
+                    due_before=end_ts,
+                )
+            except Exception:
+                logger.exception("ClickUp mirror query failed, using the API")
+
+    status_types = None
     if status and status.lower() == "open":
-        return [
-            task
-            for task in clean_tasks
-            if task.get("status_type", "") in ("open", "custom")
-        ]
+        status_types = ("open", "custom")
     elif status and status.lower() == "closed":
-        return [task for task in clean_tasks if task.get("status_type", "") == "done"]
-    else:
-        return clean_tasks
+        status_types = ("done",)
+    # Filter on status type locally: lists and folders may override the
+    # space statuses, so a statuses[] filter built from spaces would drop them
+
+    clean_tasks = []
+    async for tasks_page in iter_task_pages(url, params):
+        for x in tasks_page:
+            task = _project_task(x)
+            if status_types is None or task["status_type"] in status_types:
+                clean_tasks.append(task)
+    return clean_tasks
 
 
-def get_task(task_id: str) -> dict:
+async def get_task(task_id: str) -> dict:
     """
     Get details for a specific task by its ID.
 
@@ -322,13 +546,20 @@ def get_task(task_id: str) -> dict:
     Returns:
         dict: The full task object from the ClickUp API.
     """
-    url = f"{API_BASE_URL}/task/{task_id}"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-    return resp.json()
+    if config.CLICKUP_TASK_MIRROR:
+        from . import clickup_mirror
+
+        try:
+            task = await clickup_mirror.get_task(task_id)
+        except Exception:
+            logger.exception("ClickUp mirror lookup failed, using the API")
+            task = None
+        if task is not None:
+            return task
+    return await clickup_client.get(f"/task/{task_id}")
 
 
-def create_task(
+async def create_task(
     list_id: str,
     name: str,
     description: str,
@@ -354,38 +585,171 @@ def create_task(
         dict[str, Any]: The created task info as returned by ClickUp.
     """
     try:
-        assignee_ids = []
-        if assignees:
-            for email in assignees:
-                user = get_clickup_user_by_email(email)
-                if user:
-                    assignee_ids.append(user["id"])
-
-        payload: dict[str, Any] = {
-            "name": name,
-            "description": description,
-        }
+        workspace = await topology.get()
+        assignee_ids, unknown = _resolve_assignees(workspace, assignees)
+        payload = _due_date_fields(due_date, due_date_time)
+        payload.update({"name": name, "description": description})
         if assignee_ids:
-            payload["assignees"] = ",".join(assignee_ids)
-
-        if due_date is not None:
-            payload["due_date"] = due_date
-            if due_date_time is None:
-                has_time = (due_date % 86_400_000) != 0
-                payload["due_date_time"] = bool(has_time)
-            else:
-                payload["due_date_time"] = bool(due_date_time)
+            payload["assignees"] = assignee_ids
         if parent_task_id:
             payload["parent"] = parent_task_id
 
-        url = f"{API_BASE_URL}/list/{list_id}/task"
-        resp = requests.post(url, headers=HEADERS, json=payload)
-        resp.raise_for_status()
-        result = resp.json()
-        return {"status": "success", "task_url": result["url"], "task_id": result["id"]}
+        result = await clickup_client.post(f"/list/{list_id}/task", json=payload)
+        response = {
+            "status": "success",
+            "task_url": result["url"],
+            "task_id": result["id"],
+        }
+        if unknown:
+            response["unknown_assignees"] = unknown
+        return response
+    except Exception as e:
+        return {"status": "ERROR", "error": str(e)}
+
+
+def _resolve_assignees(
+    workspace: WorkspaceTopology, emails: list[str] | None
+) -> tuple[list[int], list[str]]:
+    """Map assignee emails to member ids; returns the ids and the unknown emails."""
+    ids, unknown = [], []
+    for email in emails or []:
+        member = workspace.members_by_email.get(str(email).lower())
+        if member:
+            ids.append(member["id"])
+        else:
+            unknown.append(email)
+    return ids, unknown
+
+
+def _due_date_fields(due_date: int | None, due_date_time: bool | None) -> dict:
+    if due_date is None:
+        return {}
+    if due_date_time is None:
+        due_date_time = (due_date % 86_400_000) != 0
+    return {"due_date": due_date, "due_date_time": bool(due_date_time)}
+
+
+def _parse_batch(items: str, required: tuple[str, ...]) -> list[dict]:
+    parsed = json.loads(items) if isinstance(items, str) else items
+    if not isinstance(parsed, list) or not all(isinstance(x, dict) for x in parsed):
+        raise ValueError("expected a JSON list of objects")
+    for i, item in enumerate(parsed):
+        missing = [key for key in required if not item.get(key)]
+        if missing:
+            raise ValueError(f"item {i} is missing: {', '.join(missing)}")
+    return parsed
+
+
+def _batch_status(results: list[dict]) -> str:
+    failed = sum(1 for x in results if x["status"] != "success")
+    if not failed:
+        return "success"
+    return "partial" if failed < len(results) else "ERROR"
+
+
+async def create_tasks(tasks: str) -> dict:
+    """
+    Create several tasks (or subtasks) in one call. Use this instead of calling `create_task` repeatedly.
+
+    Args:
+        tasks (str): A JSON string with a list of tasks. Each task accepts the `create_task` arguments:
+            "list_id" (required), "name" (required), "description", "due_date" (epoch ms), "due_date_time",
+            "assignees" (list of emails) and "parent_task_id".
+            Example: '[{"list_id": "901", "name": "Draft spec", "assignees": ["ann@example.com"], "due_date": 1767225600000}]'
+
+    Returns:
+        dict: overall status and a per-task list of results (in the same order) with task_id and task_url, or the error.
+    """
+    try:
+        items = _parse_batch(tasks, ("list_id", "name"))
+        workspace = await topology.get()
     except Exception as e:
         return {"status": "ERROR", "error": str(e)}
 
+    async def create_one(item: dict) -> dict:
+        try:
+            assignee_ids, unknown = _resolve_assignees(workspace, item.get("assignees"))
+            payload = _due_date_fields(item.get("due_date"), item.get("due_date_time"))
+            payload.update(
+                {"name": item["name"], "description": item.get("description", "")}
+            )
+            if assignee_ids:
+                payload["assignees"] = assignee_ids
+            if item.get("parent_task_id"):
+                payload["parent"] = item["parent_task_id"]
+            result = await clickup_client.post(
+                f"/list/{item['list_id']}/task", json=payload
+            )
+            response = {
+                "status": "success",
+                "name": item["name"],
+                "task_url": result["url"],
+                "task_id": result["id"],
+            }
+            if unknown:
+                response["unknown_assignees"] = unknown
+            return response
+        except Exception as e:
+            return {"status": "ERROR", "name": item["name"], "error": str(e)}
+
+    # Requests queue on the shared client, which enforces the rate limit
+    results = await asyncio.gather(*(create_one(item) for item in items))
+    return {"status": _batch_status(results), "results": results}
+
+
+async def update_tasks(updates: str) -> dict:
+    """
+    Update several existing tasks in one call.
+
+    Args:
+        updates (str): A JSON string with a list of updates. Each update requires "task_id" and may set
+            "name", "description", "status" (exact ClickUp status name), "priority" (1-4), "due_date" (epoch ms),
+            "due_date_time", "add_assignees" and "remove_assignees" (lists of emails).
+            Example: '[{"task_id": "abc123", "status": "in progress", "add_assignees": ["bob@example.com"]}]'
+
+    Returns:
+        dict: overall status and a per-task list of results (in the same order).
+    """
+    try:
+        items = _parse_batch(updates, ("task_id",))
+        workspace = await topology.get()
+    except Exception as e:
+        return {"status": "ERROR", "error": str(e)}
+
+    async def update_one(item: dict) -> dict:
+        task_id = item["task_id"]
+        try:
+            payload = {
+                key: item[key]
+                for key in ("name", "description", "status", "priority")
+                if key in item
+            }
+            payload.update(
+                _due_date_fields(item.get("due_date"), item.get("due_date_time"))
+            )
+            add_ids, unknown_add = _resolve_assignees(workspace, item.get("add_assignees"))
+            rem_ids, unknown_rem = _resolve_assignees(
+                workspace, item.get("remove_assignees")
+            )
+            if add_ids or rem_ids:
+                payload["assignees"] = {"add": add_ids, "rem": rem_ids}
+            if not payload:
+                return {"status": "ERROR", "task_id": task_id, "error": "nothing to update"}
+            result = await clickup_client.put(f"/task/{task_id}", json=payload)
+            response = {
+                "status": "success",
+                "task_id": task_id,
+                "task_url": result.get("url"),
+            }
+            if unknown_add or unknown_rem:
+                response["unknown_assignees"] = unknown_add + unknown_rem
+            return response
+        except Exception as e:
+            return {"status": "ERROR", "task_id": task_id, "error": str(e)}
+
+    results = await asyncio.gather(*(update_one(item) for item in items))
+    return {"status": _batch_status(results), "results": results}
+
 
 def get_task_link(task_id: str) -> str:
     """
@@ -407,6 +771,8 @@ clickup_toolset = [
     list_tasks_for_user,
     get_task,
     create_task,
+    create_tasks,
+    update_tasks,
     get_task_link,
 ]
 
@@ -0,0 +1,317 @@
+"""
+In-memory code search index over repository snapshots.
+
+Files are indexed by blob SHA, so a blob is read and tokenised once, no matter
+how many commits contain it:
+
+- trigram -> blob SHAs (case-folded), used to prefilter regex queries on
+  the literal substrings every match must contain;
+- blob SHA -> symbol definitions (``ast`` for Python, a regex for other
+  languages) and the text lines used for line-numbered hits.
+
+A commit is indexed the first time it is searched. Moving to a new commit only
+reads the blobs that changed since the commits already indexed, which makes
+following a branch incremental. The last few commits are kept; blobs no longer
+referenced by any of them are dropped. Nothing is persisted: after a restart
+the index is rebuilt from the local git mirror.
+"""
+
+import ast
+import fnmatch
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+COMMITS_KEPT = 4
+MAX_FILE_BYTES = 512_000  # larger files are not indexed
+MAX_LINE_CHARS = 300  # longer lines are cut in results
+SEARCH_MAX_RESULTS = 100
+
+_SYMBOL_RE = re.compile(
+    r"^\s*(?:export\s+)?(?:default\s+)?(?:pub(?:\(\w+\))?\s+)?(?:async\s+)?"
+    r"(def|class|function|func|fn|interface|type|struct|enum|trait|const|let|var)"
+    r"\s+([A-Za-z_$][\w$]*)"
+)
+_QUANTIFIERS = "?*{"
+_ESCAPE_LENGTHS = {"x": 2, "u": 4, "U": 8}
+
+
+@dataclass
+class _Blob:
+    lines: list[str]
+    trigrams: set[str]
+    symbols: list[tuple[str, str, int]] = field(default_factory=list)  # name, kind, line
+
+
+def _trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _python_symbols(source: str) -> list[tuple[str, str, int]]:
+    symbols = []
+
+    def visit(node: ast.AST, in_class: bool):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                symbols.append((child.name, "class", child.lineno))
+                visit(child, True)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if in_class else "function"
+                symbols.append((child.name, kind, child.lineno))
+                visit(child, False)
+            elif isinstance(node, ast.Module) and isinstance(
+                child, (ast.Assign, ast.AnnAssign)
+            ):
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                symbols.extend(
+                    (target.id, "variable", child.lineno)
+                    for target in targets
+                    if isinstance(target, ast.Name)
+                )
+
+    visit(ast.parse(source), False)
+    return symbols
+
+
+def _regex_symbols(lines: list[str]) -> list[tuple[str, str, int]]:
+    symbols = []
+    for number, line in enumerate(lines, 1):
+        match = _SYMBOL_RE.match(line)
+        if match:
+            symbols.append((match.group(2), match.group(1), number))
+    return symbols
+
+
+def _index_blob(path: str, data: bytes) -> _Blob | None:
+    if b"\0" in data[:8000]:
+        return None  # binary
+    text = data.decode("utf-8", errors="replace")
+    lines = text.splitlines()
+    blob = _Blob(lines=lines, trigrams=_trigrams(text))
+    if path.endswith(".py"):
+        try:
+            blob.symbols = _python_symbols(text)
+        except (SyntaxError, ValueError):
+            blob.symbols = _regex_symbols(lines)
+    else:
+        blob.symbols = _regex_symbols(lines)
+    return blob
+
+
+def required_literals(pattern: str) -> list[str]:
+    """
+    Literal substrings (3+ chars) that every match of `pattern` must contain.
+
+    Conservative: groups, classes and escapes only end a literal run, and a
+    top-level alternation means nothing is required.
+    """
+    try:
+        if re.compile(pattern).flags & re.VERBOSE:
+            return []
+    except re.error:
+        return []
+
+    runs, current, depth, i = [], [], 0, 0
+
+    def flush():
+        if len(current) >= 3:
+            runs.append("".join(current))
+        current.clear()
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            i += 2
+            if escaped and not escaped.isalnum() and depth == 0:
+                char = escaped  # an escaped metacharacter is a literal
+            else:
+                flush()
+                if escaped in _ESCAPE_LENGTHS:
+                    i += _ESCAPE_LENGTHS[escaped]
+                elif escaped == "N" and pattern[i : i + 1] == "{":
+                    i = pattern.find("}", i) + 1 or len(pattern)
+                elif escaped.isdigit():
+                    while i < len(pattern) and pattern[i].isdigit():
+                        i += 1
+                continue
+        else:
+            i += 1
+            if char == "[":
+                flush()
+                # skip the class; a ']' right after '[' or '[^' is a member
+                if pattern[i : i + 1] == "^":
+                    i += 1
+                if pattern[i : i + 1] == "]":
+                    i += 1
+                while i < len(pattern) and pattern[i] != "]":
+                    i += 2 if pattern[i] == "\\" else 1
+                i += 1
+                continue
+            if char == "{":
+                flush()  # a repetition count, not literal text
+                i = pattern.find("}", i) + 1 or len(pattern)
+                continue
+            if char == "(":
+                flush()
+                depth += 1
+                continue
+            if char == ")":
+                depth = max(depth - 1, 0)
+                continue
+            if char == "|" and depth == 0:
+                return []
+            if depth or char in ".^$*+?{}":
+                flush()
+                continue
+        # a literal character at the top level
+        following = pattern[i : i + 1]
+        if following and following in _QUANTIFIERS:
+            flush()  # optional: not required
+        elif following == "+":
+            current.append(char)
+            flush()
+        else:
+            current.append(char)
+    flush()
+    return runs
+
+
+class CodeIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commits: OrderedDict[str, dict[str, str]] = OrderedDict()  # sha -> {path: blob sha}
+        self._blobs: dict[str, _Blob | None] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def _add_blob(self, blob_sha: str, blob: _Blob | None):
+        self._blobs[blob_sha] = blob
+        if blob is not None:
+            for trigram in blob.trigrams:
+                self._postings.setdefault(trigram, set()).add(blob_sha)
+
+    def _drop_unreferenced(self):
+        live = {sha for files in self._commits.values() for sha in files.values()}
+        for blob_sha in [sha for sha in self._blobs if sha not in live]:
+            blob = self._blobs.pop(blob_sha)
+            if blob is None:
+                continue
+            for trigram in blob.trigrams:
+                postings = self._postings.get(trigram)
+                if postings is not None:
+                    postings.discard(blob_sha)
+                    if not postings:
+                        del self._postings[trigram]
+
+    def _files_at(self, source, ref: str) -> tuple[str, dict[str, str]]:
+        """
+        Index a ref of `source` (a ready `GitMirror`: indexing reads every
+        file, which must not go through the API); returns the commit SHA and
+        its files.
+        """
+        commit_sha, tree = source.tree_at(ref)
+        with self._lock:
+            files = self._commits.get(commit_sha)
+            if files is not None:
+                self._commits.move_to_end(commit_sha)
+                return commit_sha, files
+
+            files = {
+                x["path"]: x["sha"]
+                for x in tree
+                if x["type"] == "blob" and (x.get("size") or 0) <= MAX_FILE_BYTES
+            }
+            new = {sha: path for path, sha in files.items() if sha not in self._blobs}
+            contents = source.read_blobs(list(new))
+            for blob_sha, path in new.items():
+                data = contents.get(blob_sha)
+                self._add_blob(blob_sha, _index_blob(path, data) if data is not None else None)
+
+            self._commits[commit_sha] = files
+            if len(self._commits) > COMMITS_KEPT:
+                self._commits.popitem(last=False)
+                self._drop_unreferenced()
+            logger.info(
+                "Indexed commit %s: %d files, %d new blobs", commit_sha, len(files), len(new)
+            )
+            return commit_sha, files
+
+    def search_regex(
+        self,
+        source,
+        ref: str,
+        pattern: str,
+        paths: list[str] | None = None,
+        ignore_case: bool = False,
+    ) -> tuple[str, list[dict], bool]:
+        """Line-oriented regex search; returns (commit SHA, hits, truncated)."""
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        commit_sha, files = self._files_at(source, ref)
+
+        with self._lock:
+            candidates = None
+            for literal in required_literals(pattern):
+                for trigram in _trigrams(literal):
+                    postings = self._postings.get(trigram, set())
+                    candidates = set(postings) if candidates is None else candidates & postings
+
+        hits = []
+        for path, blob_sha in sorted(files.items()):
+            if candidates is not None and blob_sha not in candidates:
+                continue
+            if paths and not any(fnmatch.fnmatchcase(path, p.strip("/")) for p in paths):
+                continue
+            blob = self._blobs.get(blob_sha)
+            if blob is None:
+                continue
+            for number, line in enumerate(blob.lines, 1):
+                if regex.search(line):
+                    if len(hits) >= SEARCH_MAX_RESULTS:
+                        return commit_sha, hits, True
+                    hits.append({"path": path, "line": number, "text": line[:MAX_LINE_CHARS]})
+        return commit_sha, hits, False
+
+    def search_symbols(
+        self,
+        source,
+        ref: str,
+        name: str,
+        paths: list[str] | None = None,
+        ignore_case: bool = False,
+    ) -> tuple[str, list[dict], bool]:
+        """
+        Definitions whose name matches `name` (exact, or a glob such as
+        `get_*`); returns (commit SHA, hits, truncated).
+        """
+        commit_sha, files = self._files_at(source, ref)
+        if ignore_case:
+            name = name.lower()
+
+        hits = []
+        for path, blob_sha in sorted(files.items()):
+            if paths and not any(fnmatch.fnmatchcase(path, p.strip("/")) for p in paths):
+                continue
+            blob = self._blobs.get(blob_sha)
+            if blob is None:
+                continue
+            for symbol, kind, number in blob.symbols:
+                if fnmatch.fnmatchcase(symbol.lower() if ignore_case else symbol, name):
+                    if len(hits) >= SEARCH_MAX_RESULTS:
+                        return commit_sha, hits, True
+                    hits.append(
+                        {
+                            "path": path,
+                            "line": number,
+                            "kind": kind,
+                            "name": symbol,
+                            "text": blob.lines[number - 1][:MAX_LINE_CHARS]
+                            if number <= len(blob.lines)
+                            else "",
+                        }
+                    )
+        return commit_sha, hits, False
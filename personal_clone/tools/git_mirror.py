@@ -0,0 +1,305 @@
+"""
+Local bare clone of ``DEFAULT_GITHUB_REPO`` for repository reads.
+
+Tree listings, file reads, grep and diffs of the default repository are
+served from local git objects, so exploring the code is bounded by disk speed
+instead of the REST API rate limit. Writes and PR operations still go through
+the API (``github_tools``).
+
+The clone is a full bare clone rather than a blob-less partial one: ``git grep``
+and sized tree listings read every blob, and a partial clone would fetch them
+lazily one round trip at a time. The initial clone is seeded from the mounted
+``.git`` when available (``--reference-if-able`` + ``--dissociate``) and runs
+in a background thread; tools fall back to the API until it is ready. Refs are
+then kept current with throttled incremental fetches.
+"""
+
+import base64
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from ..app_utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+FETCH_INTERVAL = 30  # seconds refs are trusted without fetching
+CLONE_RETRY_INTERVAL = 300  # seconds between attempts after a failed clone
+CLONE_TIMEOUT = 900
+GIT_TIMEOUT = 120
+GREP_MAX_RESULTS = 200
+DIFF_MAX_BYTES = 200_000
+SEED_REPOSITORY = "./.git"  # mounted by docker-compose
+
+_HEX = set("0123456789abcdef")
+
+
+class GitMirrorError(Exception):
+    pass
+
+
+def _is_sha(ref: str) -> bool:
+    return len(ref) == 40 and set(ref) <= _HEX
+
+
+class GitMirror:
+    def __init__(self, full_name: str, directory: str, token: str = ""):
+        self.full_name = full_name
+        self._url = f"https://github.com/{full_name}.git"
+        self._path = os.path.join(directory, full_name.replace("/", "__") + ".git")
+        self._token = token
+        self._lock = threading.Lock()  # serialises clone and fetch
+        self._clone_thread: threading.Thread | None = None
+        self._clone_failed_at = 0.0
+        self._last_fetch = 0.0
+        self._trees = TTLCache(maxsize=16, ttl=float("inf"))
+        self._ready = os.path.isdir(os.path.join(self._path, "objects"))
+
+    # --- plumbing ---
+
+    def _env(self) -> dict:
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        if self._token:
+            # Passed through the environment so the token never lands in
+            # the repository config or the process arguments
+            credentials = base64.b64encode(
+                f"x-access-token:{self._token}".encode()
+            ).decode()
+            env.update(
+                {
+                    "GIT_CONFIG_COUNT": "1",
+                    "GIT_CONFIG_KEY_0": "http.https://github.com/.extraheader",
+                    "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+                }
+            )
+        return env
+
+    def _git(
+        self,
+        *args: str,
+        input: bytes | None = None,
+        timeout: float = GIT_TIMEOUT,
+        ok_codes: tuple[int, ...] = (0,),
+        git_dir: bool = True,
+    ) -> bytes:
+        command = ["git", *(("--git-dir", self._path) if git_dir else ()), *args]
+        try:
+            result = subprocess.run(
+                command,
+                input=input,
+                capture_output=True,
+                timeout=timeout,
+                env=self._env(),
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise GitMirrorError(f"git {args[0]} failed: {e}") from e
+        if result.returncode not in ok_codes:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            raise GitMirrorError(f"git {args[0]} failed: {stderr}")
+        return result.stdout
+
+    # --- lifecycle ---
+
+    def handles(self, full_name: str) -> bool:
+        return full_name.lower() == self.full_name.lower()
+
+    def ready(self) -> bool:
+        """True once the clone exists; starts (or retries) it in the background otherwise."""
+        if self._ready:
+            return True
+        with self._lock:
+            cloning = self._clone_thread is not None and self._clone_thread.is_alive()
+            if not cloning and time.monotonic() - self._clone_failed_at > CLONE_RETRY_INTERVAL:
+                self._clone_thread = threading.Thread(
+                    target=self._clone, name="git-mirror-clone", daemon=True
+                )
+                self._clone_thread.start()
+        return False
+
+    def _clone(self):
+        tmp_path = f"{self._path}.tmp"
+        try:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            args = ["clone", "--bare", "--no-tags", "--quiet"]
+            if os.path.isdir(SEED_REPOSITORY):
+                args += ["--reference-if-able", SEED_REPOSITORY, "--dissociate"]
+            self._git(*args, self._url, tmp_path, timeout=CLONE_TIMEOUT, git_dir=False)
+            os.replace(tmp_path, self._path)
+            with self._lock:
+                self._fetch_locked()
+            self._ready = True
+            logger.info("Local git mirror of %s is ready", self.full_name)
+        except (OSError, GitMirrorError):
+            self._clone_failed_at = time.monotonic()
+            logger.exception("Cloning the local git mirror of %s failed", self.full_name)
+
+    def _fetch_locked(self):
+        self._git(
+            "fetch",
+            "--prune",
+            "--quiet",
+            self._url,
+            "+refs/heads/*:refs/heads/*",
+            "+refs/tags/*:refs/tags/*",
+        )
+        self._last_fetch = time.monotonic()
+
+    def fetch(self, force: bool = False) -> bool:
+        """
+        Incremental fetch of branches and tags, at most every FETCH_INTERVAL
+        seconds unless forced. Returns whether a fetch happened.
+        """
+        with self._lock:
+            if force or time.monotonic() - self._last_fetch >= FETCH_INTERVAL:
+                self._fetch_locked()
+                return True
+        return False
+
+    def mark_stale(self):
+        """Force a fetch on the next read, e.g. after we pushed a commit."""
+        self._last_fetch = 0.0
+
+    # --- reads ---
+
+    def _rev_parse(self, ref: str) -> str | None:
+        out = self._git(
+            "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}", ok_codes=(0, 1)
+        )
+        return out.decode().strip() or None
+
+    def resolve(self, ref: str) -> str:
+        """Branch/tag/SHA -> commit SHA."""
+        if _is_sha(ref):
+            sha = self._rev_parse(ref)
+            if sha is None:
+                # A commit made since the last fetch
+                self.fetch(force=True)
+                sha = self._rev_parse(ref)
+        else:
+            fetched = self.fetch()
+            sha = self._rev_parse(ref)
+            if sha is None and not fetched:
+                # Possibly a branch created since the last fetch
+                self.fetch(force=True)
+                sha = self._rev_parse(ref)
+        if sha is None:
+            raise GitMirrorError(f"Unknown ref: {ref}")
+        return sha
+
+    def get_tree(self, commit_sha: str) -> list[dict]:
+        """Recursive listing of a commit: [{'path', 'type', 'sha', 'size', 'mode'}]."""
+        tree = self._trees.get(commit_sha)
+        if tree is not None:
+            return tree
+        out = self._git("ls-tree", "-r", "-t", "-l", "-z", commit_sha)
+        tree = []
+        for entry in out.decode("utf-8", errors="replace").split("\0"):
+            if not entry:
+                continue
+            meta, _, path = entry.partition("\t")
+            mode, kind, sha, size = meta.split()
+            tree.append(
+                {
+                    "path": path,
+                    "type": kind,
+                    "sha": sha,
+                    "size": int(size) if size.isdigit() else None,
+                    "mode": mode,
+                }
+            )
+        self._trees.set(commit_sha, tree)
+        return tree
+
+    def tree_at(self, ref: str) -> tuple[str, list[dict]]:
+        commit_sha = self.resolve(ref)
+        return commit_sha, self.get_tree(commit_sha)
+
+    def read_blobs(self, blob_shas: list[str]) -> dict[str, bytes]:
+        """Contents of many blobs with a single `git cat-file --batch`."""
+        if not blob_shas:
+            return {}
+        out = self._git(
+            "cat-file", "--batch", input="".join(f"{sha}\n" for sha in blob_shas).encode()
+        )
+        blobs, pos = {}, 0
+        while pos < len(out):
+            header_end = out.index(b"\n", pos)
+            header = out[pos:header_end].decode().split()
+            pos = header_end + 1
+            if len(header) != 3:  # "<sha> missing"
+                continue
+            size = int(header[2])
+            blobs[header[0]] = out[pos : pos + size]
+            pos += size + 1
+        return blobs
+
+    def get_blob(self, blob_sha: str) -> bytes:
+        data = self.read_blobs([blob_sha]).get(blob_sha)
+        if data is None:
+            raise GitMirrorError(f"Unknown blob: {blob_sha}")
+        return data
+
+    def read_file(self, path: str, ref: str) -> tuple[bytes, str] | None:
+        """File bytes and blob SHA at a ref, or None if the path is not a file."""
+        _, tree = self.tree_at(ref)
+        path = path.strip("/")
+        element = next(
+            (x for x in tree if x["path"] == path and x["type"] == "blob"), None
+        )
+        if element is None:
+            return None
+        return self.get_blob(element["sha"]), element["sha"]
+
+    def grep(
+        self,
+        pattern: str,
+        ref: str,
+        paths: list[str] | None = None,
+        ignore_case: bool = False,
+    ) -> tuple[list[dict], bool]:
+        """
+        `git grep -E` over a ref; returns ({'path', 'line', 'text'} hits, truncated).
+        Paths may be globs (`src/**/*.py`).
+        """
+        commit_sha = self.resolve(ref)
+        args = ["grep", "-n", "-I", "-z", "--full-name", "-E"]
+        if ignore_case:
+            args.append("-i")
+        args += ["-e", pattern, commit_sha, "--"]
+        args += [f":(glob){p.strip('/')}" for p in paths or []]
+        out = self._git(*args, ok_codes=(0, 1))  # 1 means no match
+
+        hits, prefix = [], f"{commit_sha}:"
+        for line in out.decode("utf-8", errors="replace").splitlines():
+            parts = line.split("\0", 2)
+            if len(parts) != 3:
+                continue
+            if len(hits) >= GREP_MAX_RESULTS:
+                return hits, True
+            path = parts[0][len(prefix) :] if parts[0].startswith(prefix) else parts[0]
+            hits.append({"path": path, "line": int(parts[1]), "text": parts[2]})
+        return hits, False
+
+    def diff(
+        self, base: str, head: str, paths: list[str] | None = None
+    ) -> dict:
+        """
+        Changes on `head` since it diverged from `base` (like GitHub's compare):
+        {'base_sha', 'head_sha', 'stat', 'patch', 'truncated'}.
+        """
+        base_sha, head_sha = self.resolve(base), self.resolve(head)
+        pathspec = ["--", *(f":(glob){p.strip('/')}" for p in paths or [])]
+        revisions = f"{base_sha}...{head_sha}"
+        stat = self._git("diff", "--no-color", "-M", "--stat", revisions, *pathspec)
+        patch = self._git("diff", "--no-color", "-M", revisions, *pathspec)
+        return {
+            "base_sha": base_sha,
+            "head_sha": head_sha,
+            "stat": stat.decode("utf-8", errors="replace"),
+            "patch": patch[:DIFF_MAX_BYTES].decode("utf-8", errors="replace"),
+            "truncated": len(patch) > DIFF_MAX_BYTES,
+        }
@@ -0,0 +1,209 @@
+"""
+Content-addressed cache for GitHub repository reads.
+
+Branch and tag names are resolved to commit SHAs with conditional requests
+(a 304 answer does not count against the API quota), and everything below a
+commit is addressed by SHA and therefore never goes stale:
+
+- commit SHA -> recursive tree listing
+- blob SHA -> file bytes
+
+Both are kept in bounded in-memory LRUs and persisted under
+``GITHUB_CACHE_DIR`` so they survive restarts. ``Repository`` objects are
+cached as well, so tools don't call ``get_repo`` on every invocation.
+
+PyGithub is synchronous and tools may call the cache from worker threads, so
+all cache state is guarded by a lock.
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from github import Github, Repository
+from github.GithubException import GithubException
+
+from ..app_utils.cache import TTLCache
+
+REPO_CACHE_TTL = 600  # seconds
+REF_RECHECK_INTERVAL = 30  # seconds a resolved ref is trusted without asking GitHub
+TREE_CACHE_SIZE = 64
+BLOB_CACHE_SIZE = 1024
+FOREVER = float("inf")
+
+_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+
+class GitHubCache:
+    def __init__(self, g: Github, directory: str):
+        self._g = g
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._repos = TTLCache(maxsize=32, ttl=REPO_CACHE_TTL)
+        self._refs: dict[tuple[str, str], tuple[str, str | None, float]] = {}
+        self._trees = TTLCache(maxsize=TREE_CACHE_SIZE, ttl=FOREVER)
+        self._blobs = TTLCache(maxsize=BLOB_CACHE_SIZE, ttl=FOREVER)
+        try:
+            os.makedirs(os.path.join(directory, "trees"), exist_ok=True)
+            os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+        except OSError:
+            self._directory = None  # memory-only cache
+
+    # --- repositories and refs ---
+
+    def get_repo(self, full_name: str) -> Repository.Repository:
+        with self._lock:
+            repo = self._repos.get(full_name)
+        if repo is None:
+            repo = self._g.get_repo(full_name)
+            with self._lock:
+                self._repos.set(full_name, repo)
+        return repo
+
+    def resolve_ref(self, repo: Repository.Repository, ref: str) -> str:
+        """Branch/tag/SHA -> commit SHA, revalidated with If-None-Match."""
+        if _SHA_RE.fullmatch(ref):
+            return ref
+        key = (repo.full_name, ref)
+        with self._lock:
+            entry = self._refs.get(key)
+        if entry and time.monotonic() - entry[2] < REF_RECHECK_INTERVAL:
+            return entry[0]
+
+        headers = {"Accept": "application/vnd.github.sha"}
+        if entry and entry[1]:
+            headers["If-None-Match"] = entry[1]
+        status, response_headers, body = self._g.requester.requestJson(
+            "GET", f"{repo.url}/commits/{quote(ref, safe='')}", headers=headers
+        )
+        if status == 304 and entry:
+            sha, etag = entry[0], entry[1]
+        elif status == 200:
+            sha, etag = body.strip(), response_headers.get("etag")
+        else:
+            raise GithubException(status, body, response_headers)
+        with self._lock:
+            self._refs[key] = (sha, etag, time.monotonic())
+        return sha
+
+    def forget_ref(self, full_name: str, ref: str):
+        """Drop a resolved ref after we moved it ourselves (e.g. a commit)."""
+        with self._lock:
+            self._refs.pop((full_name, ref), None)
+
+    def _persist(self, path: str | None, data: bytes):
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # the disk copy is only an optimisation
+
+    # --- trees ---
+
+    def _tree_path(self, commit_sha: str) -> str | None:
+        if self._directory is None:
+            return None
+        return os.path.join(self._directory, "trees", f"{commit_sha}.json")
+
+    def get_tree(self, repo: Repository.Repository, commit_sha: str) -> list[dict]:
+        """Recursive listing of a commit: [{'path', 'type', 'sha', 'size', 'mode'}]."""
+        with self._lock:
+            tree = self._trees.get(commit_sha)
+        if tree is not None:
+            return tree
+        path = self._tree_path(commit_sha)
+        try:
+            with open(path) as f:
+                tree = json.load(f)
+        except (OSError, TypeError, ValueError):
+            git_tree = repo.get_git_tree(commit_sha, recursive=True)
+            tree = [
+                {
+                    "path": element.path,
+                    "type": element.type,
+                    "sha": element.sha,
+                    "size": element.size,
+                    "mode": element.mode,
+                }
+                for element in git_tree.tree
+            ]
+            self._persist(path, json.dumps(tree).encode("utf-8"))
+        with self._lock:
+            self._trees.set(commit_sha, tree)
+        return tree
+
+    def tree_at(self, repo: Repository.Repository, ref: str) -> tuple[str, list[dict]]:
+        commit_sha = self.resolve_ref(repo, ref)
+        return commit_sha, self.get_tree(repo, commit_sha)
+
+    # --- blobs ---
+
+    def _blob_path(self, blob_sha: str) -> str | None:
+        if self._directory is None:
+            return None
+        return os.path.join(self._directory, "blobs", blob_sha[:2], blob_sha)
+
+    def get_blob(self, repo: Repository.Repository, blob_sha: str) -> bytes:
+        with self._lock:
+            data = self._blobs.get(blob_sha)
+        if data is not None:
+            return data
+        path = self._blob_path(blob_sha)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except (OSError, TypeError):
+            blob = repo.get_git_blob(blob_sha)
+            data = (
+                base64.b64decode(blob.content)
+                if blob.encoding == "base64"
+                else blob.content.encode("utf-8")
+            )
+            self._persist(path, data)
+        with self._lock:
+            self._blobs.set(blob_sha, data)
+        return data
+
+    def read_file(
+        self, repo: Repository.Repository, path: str, ref: str
+    ) -> tuple[bytes, str] | None:
+        """File bytes and blob SHA at a ref, or None if the path is not a file."""
+        _, tree = self.tree_at(repo, ref)
+        path = path.strip("/")
+        element = next(
+            (x for x in tree if x["path"] == path and x["type"] == "blob"), None
+        )
+        if element is None:
+            return None
+        return self.get_blob(repo, element["sha"]), element["sha"]
+
+
+class RepoReader:
+    """A repository bound to the cache, with the same read API as `GitMirror`."""
+
+    def __init__(self, cache: GitHubCache, repo: Repository.Repository, max_workers: int):
+        self._cache = cache
+        self._repo = repo
+        self._max_workers = max_workers
+
+    def tree_at(self, ref: str) -> tuple[str, list[dict]]:
+        return self._cache.tree_at(self._repo, ref)
+
+    def read_file(self, path: str, ref: str) -> tuple[bytes, str] | None:
+        return self._cache.read_file(self._repo, path, ref)
+
+    def read_blobs(self, blob_shas: list[str]) -> dict[str, bytes]:
+        # PyGithub is blocking: fetch the blobs the cache doesn't have in parallel
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            contents = pool.map(lambda sha: self._cache.get_blob(self._repo, sha), blob_shas)
+            return dict(zip(blob_shas, contents))
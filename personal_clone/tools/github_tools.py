@@ -1,12 +1,24 @@
 # from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 # from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
 # from mcp import StdioServerParameters
+import fnmatch
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import github
-from github import Github, Repository
+from github import Github, InputGitTreeElement, Repository
 from github.GithubException import GithubException
 from google.adk.tools.tool_context import ToolContext
 
 from .. import config
+from .code_index import CodeIndex
+from .git_mirror import DIFF_MAX_BYTES, GitMirror, GitMirrorError
+from .github_cache import GitHubCache, RepoReader
+
+GITHUB_MAX_WORKERS = 8  # concurrent PyGithub calls (they are blocking)
+READ_FILES_MAX_BYTES = 200_000  # total content returned by one read_files call
+READ_FILES_MAX_FILES = 50
 
 # def create_github_mcp_toolset():
 #     try:
@@ -68,6 +80,31 @@ def create_github_toolset():
                 "error_message": "Github connection not initialized:",
             }
 
+        cache = GitHubCache(g, config.GITHUB_CACHE_DIR)
+        code_index = CodeIndex()
+        mirror = (
+            GitMirror(
+                config.DEFAULT_GITHUB_REPO, config.GITHUB_MIRROR_DIR, config.GITHUB_TOKEN
+            )
+            if config.GITHUB_LOCAL_MIRROR and config.DEFAULT_GITHUB_REPO
+            else None
+        )
+        if mirror is not None:
+            mirror.ready()  # starts the initial clone in the background
+
+        def get_repo(tool_context: ToolContext, owner: str, repo_name: str):
+            return tool_context.state.get("current_repo") or cache.get_repo(
+                f"{owner}/{repo_name}"
+            )
+
+        def reader(tool_context: ToolContext, owner: str, repo_name: str):
+            """Local git mirror for the default repo once cloned, the API cache otherwise."""
+            if mirror is not None and mirror.handles(f"{owner}/{repo_name}") and mirror.ready():
+                return mirror
+            return RepoReader(
+                cache, get_repo(tool_context, owner, repo_name), GITHUB_MAX_WORKERS
+            )
+
         def get_github_repo(
             tool_context: ToolContext, owner: str, repo_name: str
         ) -> dict:
@@ -81,7 +118,7 @@ def create_github_toolset():
                 dict: {'status': 'success'/'error', 'payload': repo_obj or None, 'error_message': str}.
             """
             try:
-                repo: Repository.Repository = g.get_repo(f"{owner}/{repo_name}")
+                repo: Repository.Repository = cache.get_repo(f"{owner}/{repo_name}")
                 tool_context.state["current_repo"] = repo
                 return {
                     "status": "success",
@@ -114,34 +151,39 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': list of {'name': str, 'path': str, 'type': 'file'/'dir', 'sha': str}}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                _, tree = reader(tool_context, repo_owner, repo_name).tree_at(ref)
                 if recursive:
-                    tree = repo.get_git_tree(ref, recursive=True)
                     files = [
                         {
-                            "name": element.path.split("/")[-1],
-                            "path": element.path,
-                            "type": element.type,
-                            "sha": element.sha,
+                            "name": element["path"].split("/")[-1],
+                            "path": element["path"],
+                            "type": element["type"],
+                            "sha": element["sha"],
                         }
-                        for element in tree.tree
-                        if path in element.path
+                        for element in tree
+                        if path in element["path"]
                     ]
                 else:
-                    contents = repo.get_contents(path, ref=ref)
+                    directory = path.strip("/")
                     files = [
                         {
-                            "name": c.name,
-                            "path": c.path,
-                            "type": "file" if c.type == "file" else "dir",
-                            "sha": c.sha,
+                            "name": element["path"].split("/")[-1],
+                            "path": element["path"],
+                            "type": "file" if element["type"] == "blob" else "dir",
+                            "sha": element["sha"],
                         }
-                        for c in contents  # type: ignore
+                        for element in tree
+                        if element["path"].rpartition("/")[0] == directory
                     ]
+                    if not files and not any(
+                        x["path"] == directory and x["type"] == "tree" for x in tree
+                    ):
+                        return {
+                            "status": "error",
+                            "error_message": f"Path {path} not found at {ref}",
+                        }
                 return {"status": "success", "payload": files}
-            except GithubException as e:
+            except (GithubException, GitMirrorError) as e:
                 return {"status": "error", "error_message": str(e)}
 
         def read_file_contents(
@@ -163,18 +205,246 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': {'content': str (decoded), 'encoding': str}, 'error_message': str}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
-                file_content = repo.get_contents(file_path, ref=ref)
-                content = file_content.decoded_content.decode("utf-8") if file_content.decoded_content else ""  # type: ignore
-                return {"status": "success", "payload": {"content": content, "encoding": file_content.encoding, "sha": file_content.sha}}  # type: ignore
-            except GithubException as e:
+                source = reader(tool_context, repo_owner, repo_name)
+                found = source.read_file(file_path, ref)
+                if found is None:
+                    return {
+                        "status": "error",
+                        "error_message": f"File not found: {file_path} at {ref}",
+                    }
+                data, sha = found
+                content = data.decode("utf-8", errors="replace")
+                return {"status": "success", "payload": {"content": content, "encoding": "utf-8", "sha": sha}}
+            except (GithubException, GitMirrorError) as e:
                 return {
                     "status": "error",
                     "error_message": f"File not found or access denied: {e}",
                 }
 
+        def read_files(
+            repo_owner: str,
+            repo_name: str,
+            paths: str,
+            ref: str,
+            tool_context: ToolContext,
+        ) -> dict:
+            """
+            Reads many files in ONE call. Prefer this over calling `read_file_contents` once per file.
+            Args:
+                repo_owner: Repo owner.
+                repo_name: Repo name.
+                paths: JSON string with a list of file paths and/or glob patterns, or a single glob.
+                    `*` also matches `/`. Examples: '["src/main.py", "src/utils/*.py"]', 'tests/*.py'.
+                ref: Branch/commit/tag.
+                tool_context: For caching.
+            Returns:
+                dict: {'status': str, 'payload': {'files': list of {'path', 'sha', 'content', 'truncated'},
+                       'skipped': list of {'path', 'reason'}, 'missing': list of str}, 'error_message': str}.
+                Files are returned in the requested order until READ_FILES_MAX_BYTES is used up.
+            """
+            try:
+                patterns = json.loads(paths) if paths.lstrip().startswith("[") else [paths]
+                if not isinstance(patterns, list) or not all(
+                    isinstance(x, str) for x in patterns
+                ):
+                    raise ValueError("`paths` must be a list of strings")
+            except ValueError as e:
+                return {"status": "error", "error_message": str(e)}
+
+            try:
+                source = reader(tool_context, repo_owner, repo_name)
+                _, tree = source.tree_at(ref)
+                blobs = [x for x in tree if x["type"] == "blob"]
+                by_path = {x["path"]: x for x in blobs}
+
+                selected, missing, seen = [], [], set()
+                for pattern in patterns:
+                    pattern = pattern.strip().strip("/")
+                    if pattern in by_path:
+                        matches = [by_path[pattern]]
+                    else:
+                        matches = [x for x in blobs if fnmatch.fnmatchcase(x["path"], pattern)]
+                    if not matches:
+                        missing.append(pattern)
+                    for element in matches:
+                        if element["path"] not in seen:
+                            seen.add(element["path"])
+                            selected.append(element)
+
+                # Plan against the sizes in the tree so nothing over budget is fetched
+                planned, skipped, budget = [], [], READ_FILES_MAX_BYTES
+                for element in selected:
+                    if len(planned) >= READ_FILES_MAX_FILES:
+                        skipped.append({"path": element["path"], "reason": "file limit"})
+                    elif budget <= 0:
+                        skipped.append({"path": element["path"], "reason": "byte budget"})
+                    else:
+                        limit = min(element.get("size") or 0, budget)
+                        planned.append((element, limit))
+                        budget -= limit
+
+                contents = source.read_blobs([element["sha"] for element, _ in planned])
+
+                files = []
+                for element, limit in planned:
+                    data = contents.get(element["sha"], b"")
+                    if b"\0" in data[:8000]:
+                        skipped.append({"path": element["path"], "reason": "binary"})
+                        continue
+                    files.append(
+                        {
+                            "path": element["path"],
+                            "sha": element["sha"],
+                            "content": data[:limit].decode("utf-8", errors="replace"),
+                            "truncated": len(data) > limit,
+                        }
+                    )
+                return {
+                    "status": "success",
+                    "payload": {"files": files, "skipped": skipped, "missing": missing},
+                }
+            except (GithubException, GitMirrorError) as e:
+                return {"status": "error", "error_message": str(e)}
+
+        def search_code(
+            repo_owner: str,
+            repo_name: str,
+            query: str,
+            kind: str,
+            ref: str,
+            paths: str,
+            ignore_case: bool,
+            tool_context: ToolContext,
+        ) -> dict:
+            """
+            Searches the default repo with a prebuilt index (needs the local mirror); the fastest way to answer "where is X defined/used".
+            Args:
+                repo_owner: Repo owner.
+                repo_name: Repo name.
+                query: For kind='symbol', a definition name or glob (e.g. 'create_task', 'get_*').
+                    For kind='regex', a Python regular expression matched line by line (e.g. 'config\\.GITHUB_\\w+').
+                kind: 'symbol' to find where functions/classes/variables are defined, 'regex' to find usages.
+                ref: Branch/commit/tag.
+                paths: JSON string with a list of path globs to limit the search, e.g. '["personal_clone/tools/*"]', or '' for the whole repo.
+                ignore_case: `True` for a case-insensitive search.
+                tool_context: For caching.
+            Returns:
+                dict: {'status': str, 'payload': {'commit_sha': str, 'hits': list of {'path', 'line', 'text'} (symbol hits also
+                       have 'name' and 'kind'), 'truncated': bool}, 'error_message': str}.
+            """
+            if mirror is None or not mirror.handles(f"{repo_owner}/{repo_name}"):
+                return {
+                    "status": "error",
+                    "error_message": "search_code only indexes the default repo; use read_files instead",
+                }
+            # Indexing reads every file: only do it from local git objects,
+            # never through the API
+            if not mirror.ready():
+                return {
+                    "status": "error",
+                    "error_message": "The local mirror is still being cloned; retry shortly or use read_files",
+                }
+            if kind not in ("symbol", "regex"):
+                return {"status": "error", "error_message": "kind must be 'symbol' or 'regex'"}
+            try:
+                globs = json.loads(paths) if paths.strip() else []
+                search = (
+                    code_index.search_symbols
+                    if kind == "symbol"
+                    else code_index.search_regex
+                )
+                commit_sha, hits, truncated = search(mirror, ref, query, globs, ignore_case)
+                return {
+                    "status": "success",
+                    "payload": {"commit_sha": commit_sha, "hits": hits, "truncated": truncated},
+                }
+            except (ValueError, re.error, GitMirrorError) as e:
+                return {"status": "error", "error_message": str(e)}
+
+        def grep_repo(
+            repo_owner: str,
+            repo_name: str,
+            pattern: str,
+            ref: str,
+            paths: str,
+            ignore_case: bool,
+            tool_context: ToolContext,
+        ) -> dict:
+            """
+            Searches file contents with an extended regex (like `git grep -E`). Only available for the default repo.
+            Args:
+                repo_owner: Repo owner.
+                repo_name: Repo name.
+                pattern: Extended regular expression, e.g. 'def (create|update)_task'.
+                ref: Branch/commit/tag.
+                paths: JSON string with a list of path globs to limit the search, e.g. '["personal_clone/**/*.py"]', or '' for the whole repo.
+                ignore_case: `True` for a case-insensitive search.
+                tool_context: For caching.
+            Returns:
+                dict: {'status': str, 'payload': {'hits': list of {'path', 'line', 'text'}, 'truncated': bool}, 'error_message': str}.
+            """
+            if mirror is None or not mirror.handles(f"{repo_owner}/{repo_name}"):
+                return {
+                    "status": "error",
+                    "error_message": "grep is only available for the default repo; use read_files instead",
+                }
+            if not mirror.ready():
+                return {
+                    "status": "error",
+                    "error_message": "The local mirror is still being cloned; retry shortly or use read_files",
+                }
+            try:
+                globs = json.loads(paths) if paths.strip() else []
+                hits, truncated = mirror.grep(pattern, ref, globs, ignore_case)
+                return {"status": "success", "payload": {"hits": hits, "truncated": truncated}}
+            except (ValueError, GitMirrorError) as e:
+                return {"status": "error", "error_message": str(e)}
+
+        def diff_refs(
+            repo_owner: str,
+            repo_name: str,
+            base: str,
+            head: str,
+            tool_context: ToolContext,
+        ) -> dict:
+            """
+            Shows the changes on `head` since it diverged from `base` (same semantics as a PR diff).
+            Args:
+                repo_owner: Repo owner.
+                repo_name: Repo name.
+                base: Base branch/commit/tag (e.g. 'master').
+                head: Branch/commit/tag to compare.
+                tool_context: For caching.
+            Returns:
+                dict: {'status': str, 'payload': {'base_sha', 'head_sha', 'stat': str, 'patch': str, 'truncated': bool}, 'error_message': str}.
+            """
+            try:
+                source = reader(tool_context, repo_owner, repo_name)
+                if source is mirror:
+                    return {"status": "success", "payload": mirror.diff(base, head)}
+
+                repo = get_repo(tool_context, repo_owner, repo_name)
+                comparison = repo.compare(base, head)
+                files = list(comparison.files)
+                patch = "\n".join(
+                    f"--- a/{f.previous_filename or f.filename}\n+++ b/{f.filename}\n{f.patch or ''}"
+                    for f in files
+                )
+                return {
+                    "status": "success",
+                    "payload": {
+                        "base_sha": cache.resolve_ref(repo, base),
+                        "head_sha": cache.resolve_ref(repo, head),
+                        "stat": "\n".join(
+                            f"{f.filename} | +{f.additions} -{f.deletions}" for f in files
+                        ),
+                        "patch": patch[:DIFF_MAX_BYTES],
+                        "truncated": len(patch) > DIFF_MAX_BYTES,
+                    },
+                }
+            except (GithubException, GitMirrorError) as e:
+                return {"status": "error", "error_message": str(e)}
+
         def create_branch(
             repo_owner: str,
             repo_name: str,
@@ -194,9 +464,7 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': {'branch': branch_obj}, 'error_message': str}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                repo = get_repo(tool_context, repo_owner, repo_name)
                 source_branch = repo.get_branch(from_branch)
                 repo.create_git_ref(
                     f"refs/heads/{branch_name}", source_branch.commit.sha
@@ -240,9 +508,7 @@ def create_github_toolset():
                     "message": "you must not commit to master/main branch",
                 }
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                repo = get_repo(tool_context, repo_owner, repo_name)
                 try:
                     existing_file = repo.get_contents(file_path, ref=branch_name)
                     result = repo.update_file(
@@ -257,6 +523,9 @@ def create_github_toolset():
                         file_path, commit_message, content, branch=branch_name
                     )
                 commit = result["commit"]
+                cache.forget_ref(repo.full_name, branch_name)
+                if mirror is not None and mirror.handles(repo.full_name):
+                    mirror.mark_stale()
                 tool_context.state["last_commit_sha"] = commit.sha
                 return {
                     "status": "success",
@@ -268,6 +537,101 @@ def create_github_toolset():
             except GithubException as e:
                 return {"status": "error", "error_message": str(e)}
 
+        def commit_files(
+            repo_owner: str,
+            repo_name: str,
+            branch_name: str,
+            files: str,
+            commit_message: str,
+            tool_context: ToolContext,
+        ) -> dict:
+            """
+            Commits changes to many files (including deletions) as ONE commit on a branch.
+            Prefer this over calling `commit_to_branch` once per file.
+            Args:
+                repo_owner: Repo owner.
+                repo_name: Repo name.
+                branch_name: Target branch (must already exist).
+                files: JSON string with a list of changes. Each item is {"path": str, "content": str} to create/update a file,
+                    or {"path": str, "delete": true} to delete one.
+                    Example: '[{"path": "src/a.py", "content": "print(1)"}, {"path": "old.txt", "delete": true}]'
+                commit_message: Commit message.
+                tool_context: For state and actions.
+            Returns:
+                dict: {'status': str, 'payload': {'commit_sha': str, 'files_changed': int}, 'error_message': str}.
+            """
+            if branch_name in ("master", "main"):
+                return {
+                    "status": "forbidden",
+                    "message": "you must not commit to master/main branch",
+                }
+            try:
+                changes = json.loads(files) if isinstance(files, str) else files
+                if not isinstance(changes, list) or not changes:
+                    raise ValueError("`files` must be a non-empty list")
+                for change in changes:
+                    if not isinstance(change, dict) or not change.get("path"):
+                        raise ValueError("every change needs a `path`")
+                    if not change.get("delete") and not isinstance(
+                        change.get("content"), str
+                    ):
+                        raise ValueError(f"`content` missing for {change['path']}")
+            except ValueError as e:
+                return {"status": "error", "error_message": str(e)}
+
+            try:
+                repo = get_repo(tool_context, repo_owner, repo_name)
+                ref = repo.get_git_ref(f"heads/{branch_name}")
+                base_commit = repo.get_git_commit(ref.object.sha)
+                # Keep the mode of existing files (e.g. the +x bit of scripts)
+                modes = {
+                    x["path"]: x["mode"]
+                    for x in cache.get_tree(repo, base_commit.sha)
+                    if x["type"] == "blob"
+                }
+
+                updates = [c for c in changes if not c.get("delete")]
+                with ThreadPoolExecutor(max_workers=GITHUB_MAX_WORKERS) as pool:
+                    blobs = list(
+                        pool.map(
+                            lambda c: repo.create_git_blob(c["content"], "utf-8"),
+                            updates,
+                        )
+                    )
+                elements = [
+                    InputGitTreeElement(
+                        c["path"], modes.get(c["path"], "100644"), "blob", sha=blob.sha
+                    )
+                    for c, blob in zip(updates, blobs)
+                ]
+                # A null sha removes the path from the base tree
+                elements.extend(
+                    InputGitTreeElement(
+                        c["path"], modes.get(c["path"], "100644"), "blob", sha=None
+                    )
+                    for c in changes
+                    if c.get("delete")
+                )
+
+                tree = repo.create_git_tree(elements, base_tree=base_commit.tree)
+                commit = repo.create_git_commit(commit_message, tree, [base_commit])
+                # Not forced: fails if the branch moved since we read it
+                ref.edit(commit.sha)
+                cache.forget_ref(repo.full_name, branch_name)
+                if mirror is not None and mirror.handles(repo.full_name):
+                    mirror.mark_stale()
+                tool_context.state["last_commit_sha"] = commit.sha
+                return {
+                    "status": "success",
+                    "payload": {
+                        "commit_sha": commit.sha,
+                        "commit_message": commit.message,
+                        "files_changed": len(changes),
+                    },
+                }
+            except GithubException as e:
+                return {"status": "error", "error_message": str(e)}
+
         def create_pull_request(
             repo_owner: str,
             repo_name: str,
@@ -291,9 +655,7 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': {'pr_url': str, 'pr_number': int}, 'error_message': str}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                repo = get_repo(tool_context, repo_owner, repo_name)
                 pr = repo.create_pull(
                     title=title, body=body, head=head_branch, base=base_branch
                 )
@@ -326,9 +688,7 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': {'title': str, 'state': str, 'comments': int, 'commits': int}, 'error_message': str}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                repo = get_repo(tool_context, repo_owner, repo_name)
                 pr = repo.get_pull(pr_number)
                 return {
                     "status": "success",
@@ -364,9 +724,7 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': {'merged': bool, 'sha': str}, 'error_message': str}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                repo = get_repo(tool_context, repo_owner, repo_name)
                 pr = repo.get_pull(pr_number)
                 if commit_title:
                     pr.merge(merge_method=merge_method, commit_title=commit_title)
@@ -392,9 +750,7 @@ def create_github_toolset():
                 dict: {'status': str, 'payload': list of {'name': str, 'commit_sha': str}}.
             """
             try:
-                repo = tool_context.state.get("current_repo") or g.get_repo(
-                    f"{repo_owner}/{repo_name}"
-                )
+                repo = get_repo(tool_context, repo_owner, repo_name)
                 branches = [
                     {"name": b.name, "commit_sha": b.commit.sha}
                     for b in repo.get_branches()
@@ -407,8 +763,13 @@ def create_github_toolset():
             get_github_repo,
             list_repo_files,
             read_file_contents,
+            read_files,
+            search_code,
+            grep_repo,
+            diff_refs,
             create_branch,
             commit_to_branch,
+            commit_files,
             create_pull_request,
             get_pr_details,
             list_branches,
@@ -0,0 +1,386 @@
+"""
+Bulk import/export of Pinecone namespaces as JSONL.
+
+Import validates every line the same way ``create_memory``/``create_people``
+do, upserts in batches of ``UPSERT_BATCH_SIZE`` records with bounded
+concurrency and records its progress in a checkpoint file, so an interrupted
+import resumes where it stopped. Export streams a namespace to JSONL, one
+``{"id": ..., **metadata}`` object per line.
+
+Usage:
+    python -m personal_clone.tools.pinecone_bulk import notes.jsonl --namespace professional
+    python -m personal_clone.tools.pinecone_bulk export professional professional.jsonl
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+
+import click
+
+from .. import config
+from . import pinecone_tools
+from .pinecone_tools import (
+    identity_index,
+    index_manager,
+    invalidate_search_cache,
+    iter_records,
+    text_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 96  # upsert_records limit for indexes with integrated embedding
+UPSERT_CONCURRENCY = 4
+UPSERT_ATTEMPTS = 3
+MEMORY_NAMESPACES = (
+    config.PINECONE_PERSONAL_NAMESPACE,
+    config.PINECONE_PROFESSIONAL_NAMESPACE,
+)
+PEOPLE_NAMESPACE = "people"
+
+
+def _created_at(value) -> int:
+    if value is None or value == "":
+        return int(datetime.now().timestamp())
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.fromisoformat(str(value)).timestamp())
+
+
+def _record_id(prefix: str, created_at: int, line: str) -> str:
+    # Deterministic, so re-importing a line after a resume overwrites the
+    # record instead of duplicating it.
+    date_part = datetime.fromtimestamp(created_at).strftime("%Y_%m_%d")
+    return f"{prefix}_{date_part}_{uuid.uuid5(uuid.NAMESPACE_OID, line).hex}"
+
+
+def _json_list(value, field: str) -> list:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, list):
+        raise ValueError(f"`{field}` must be a list")
+    return value
+
+
+def build_memory_record(raw: dict, user_id: str, line: str) -> dict:
+    """Validates one memory and returns it in the shape ``create_memory`` stores."""
+    missing = [
+        field
+        for field in ("text", "short_description", "category")
+        if not raw.get(field)
+    ]
+    if raw.get("tags") is None:
+        missing.append("tags")
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    if raw["category"] not in config.MEMORY_CATEGORIES:
+        raise ValueError(f"Unknown category `{raw['category']}`")
+    tags = _json_list(raw["tags"], "tags")
+    created_at = _created_at(raw.get("created_at"))
+    record = {
+        "id": raw.get("id") or _record_id("mem", created_at, line),
+        "user_id": raw.get("user_id") or user_id,
+        "created_at": created_at,
+        "text": raw["text"],
+        "short_description": raw["short_description"],
+        "category": raw["category"],
+        "tags": [str(tag) for tag in tags],
+        "text_hash": text_hash(raw["text"]),
+    }
+    related_people = _json_list(raw.get("related_people"), "related_people")
+    if related_people:
+        record["related_people"] = related_people
+    related_memories = _json_list(raw.get("related_memories"), "related_memories")
+    if related_memories:
+        record["related_memories"] = json.dumps(related_memories)
+    return record
+
+
+def build_person_record(raw: dict, line: str) -> dict:
+    """Validates one person and returns it in the shape ``create_people`` stores."""
+    missing = [
+        field for field in ("first_name", "role", "user_ids") if not raw.get(field)
+    ]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    user_ids = _json_list(raw["user_ids"], "user_ids")
+    if not all(isinstance(x, dict) and x.get("id_value") for x in user_ids):
+        raise ValueError("`user_ids` items must have an `id_value`")
+    first_name = raw["first_name"]
+    last_name = raw.get("last_name") or ""
+    created_at = _created_at(raw.get("created_at"))
+    user_ids_str = ", ".join([x["id_value"] for x in user_ids])
+    record = {
+        "id": raw.get("id") or _record_id("per", created_at, line),
+        "created_at": created_at,
+        "first_name": first_name,
+        "last_name": last_name,
+        "text": f"{first_name} {last_name}. IDs: {user_ids_str}".strip(),
+        "role": raw["role"],
+        "user_ids": json.dumps(user_ids),
+    }
+    relations = _json_list(raw.get("relations"), "relations")
+    if relations:
+        record["relations"] = json.dumps(relations)
+    return record
+
+
+def build_record(line: str, namespace: str, user_id: str) -> dict:
+    raw = json.loads(line)
+    if not isinstance(raw, dict):
+        raise ValueError("Each line must be a JSON object")
+    if namespace == PEOPLE_NAMESPACE:
+        return build_person_record(raw, line)
+    return build_memory_record(raw, user_id, line)
+
+
+class _Checkpoint:
+    """Number of input lines fully upserted, persisted next to the input file."""
+
+    def __init__(self, path: str, source: str, namespace: str):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.namespace = namespace
+        self.done_lines = 0
+        self._finished: dict[int, int] = {}  # batch start line -> end line
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        if data.get("source") == self.source and data.get("namespace") == self.namespace:
+            self.done_lines = int(data.get("done_lines", 0))
+
+    def finish(self, start: int, end: int):
+        """Mark lines [start, end) as done and advance past contiguous batches."""
+        self._finished[start] = end
+        advanced = False
+        while self.done_lines in self._finished:
+            self.done_lines = self._finished.pop(self.done_lines)
+            advanced = True
+        if advanced:
+            self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "source": self.source,
+                    "namespace": self.namespace,
+                    "done_lines": self.done_lines,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def _upsert_batch(namespace: str, records: list[dict]):
+    for attempt in range(UPSERT_ATTEMPTS):
+        try:
+            index = await index_manager.get()
+            await index.upsert_records(namespace=namespace, records=records)
+            return
+        except Exception as e:
+            index_manager.note_error(e)
+            if attempt == UPSERT_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(2**attempt)
+
+
+async def import_records(
+    path: str,
+    namespace: str,
+    user_id: str = "bulk_import",
+    concurrency: int = UPSERT_CONCURRENCY,
+    restart: bool = False,
+) -> dict:
+    """
+    Imports a JSONL file of memories or people into a namespace.
+
+    Args:
+        path (str): JSONL file, one memory (or person, for the `people` namespace) per line.
+        namespace (str): "personal", "professional" or "people".
+        user_id (str): Owner stored on memories that don't carry a `user_id`.
+        concurrency (int): How many upsert batches may be in flight.
+        restart (bool): Ignore an existing checkpoint and import from the first line.
+
+    Returns:
+        dict: counts of imported and skipped lines, the line import resumed from
+        and the validation errors (line number -> message). If a batch still
+        fails after retries the import stops with status "error" and keeps its
+        checkpoint, so running it again resumes after the last imported batch.
+    """
+    if namespace not in MEMORY_NAMESPACES + (PEOPLE_NAMESPACE,):
+        return {"status": "error", "message": f"Unknown namespace `{namespace}`"}
+
+    checkpoint = _Checkpoint(f"{path}.checkpoint", path, namespace)
+    if not restart:
+        checkpoint.load()
+    resumed_from = checkpoint.done_lines
+
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: list[asyncio.Task] = []
+    errors: dict[int, str] = {}
+    failures: list[str] = []
+    imported = 0
+    written_ids: set[str] = set()
+
+    async def run_batch(start: int, end: int, records: list[dict]):
+        nonlocal imported
+        try:
+            if records:
+                await _upsert_batch(namespace, records)
+                imported += len(records)
+                # Rows with an explicit id may overwrite existing records
+                written_ids.update(record["id"] for record in records)
+                if namespace == PEOPLE_NAMESPACE:
+                    identity_index.set_people(
+                        {record["id"]: record["user_ids"] for record in records}
+                    )
+            # Only batches that made it advance the checkpoint
+            checkpoint.finish(start, end)
+        except Exception as e:
+            logger.error("Import of lines %d-%d failed: %s", start + 1, end, e)
+            failures.append(f"lines {start + 1}-{end}: {e}")
+        finally:
+            semaphore.release()
+
+    async def submit(start: int, end: int, records: list[dict]):
+        await semaphore.acquire()
+        tasks.append(asyncio.create_task(run_batch(start, end, records)))
+
+    try:
+        batch: list[dict] = []
+        batch_start = resumed_from
+        line_no = 0
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f):
+                if line_no < resumed_from:
+                    continue
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch.append(build_record(line, namespace, user_id))
+                except (ValueError, TypeError) as e:
+                    errors[line_no + 1] = str(e)
+                    continue
+                if len(batch) == UPSERT_BATCH_SIZE:
+                    await submit(batch_start, line_no + 1, batch)
+                    batch, batch_start = [], line_no + 1
+                # Stop reading after a failed batch; the checkpoint marks
+                # where a rerun resumes
+                if failures:
+                    break
+            else:
+                end = max(line_no + 1, batch_start)
+                if end > batch_start:
+                    await submit(batch_start, end, batch)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if written_ids:
+            invalidate_search_cache(namespace, written_ids)
+
+    if failures:
+        return {
+            "status": "error",
+            "imported": imported,
+            "skipped": len(errors),
+            "resumed_from_line": resumed_from + 1,
+            "resume_at_line": checkpoint.done_lines + 1,
+            "failures": failures,
+            "errors": errors,
+        }
+    checkpoint.remove()
+    return {
+        "status": "success",
+        "imported": imported,
+        "skipped": len(errors),
+        "resumed_from_line": resumed_from + 1,
+        "errors": errors,
+    }
+
+
+async def export_namespace(namespace: str, path: str) -> dict:
+    """
+    Streams every record of a namespace to a JSONL file.
+
+    Returns:
+        dict: the number of exported records and the output path.
+    """
+    exported = 0
+    index = await index_manager.get()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        async for batch in iter_records(index, namespace):
+            for record_id, metadata in batch.items():
+                f.write(json.dumps({"id": record_id, **metadata}, ensure_ascii=False))
+                f.write("\n")
+            exported += len(batch)
+    os.replace(tmp_path, path)
+    return {"status": "success", "exported": exported, "path": path}
+
+
+async def _run(coro):
+    try:
+        return await coro
+    finally:
+        await pinecone_tools.close_pinecone_clients()
+
+
+@click.group()
+def cli():
+    """Bulk import/export of Pinecone memories and people."""
+    logging.basicConfig(level=logging.INFO)
+
+
+@cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--namespace",
+    required=True,
+    type=click.Choice(list(MEMORY_NAMESPACES + (PEOPLE_NAMESPACE,))),
+)
+@click.option("--user-id", default="bulk_import", help="Owner for memories without one")
+@click.option("--concurrency", type=int, default=UPSERT_CONCURRENCY)
+@click.option("--restart", is_flag=True, help="Ignore an existing checkpoint")
+def import_command(path, namespace, user_id, concurrency, restart):
+    """Import a JSONL file into NAMESPACE, resuming from the last checkpoint."""
+    result = asyncio.run(
+        _run(import_records(path, namespace, user_id, concurrency, restart))
+    )
+    click.echo(json.dumps(result, indent=2))
+    if result["status"] != "success":
+        raise SystemExit(1)
+
+
+@cli.command("export")
+@click.argument(
+    "namespace", type=click.Choice(list(MEMORY_NAMESPACES + (PEOPLE_NAMESPACE,)))
+)
+@click.argument("path", type=click.Path(dir_okay=False))
+def export_command(namespace, path):
+    """Export every record of NAMESPACE to a JSONL file at PATH."""
+    result = asyncio.run(_run(export_namespace(namespace, path)))
+    click.echo(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,320 @@
+"""
+Local mirror of small Pinecone namespaces.
+
+Each mirrored namespace is kept on disk as a float32 matrix of L2-normalised
+vectors (``<namespace>.npy``, opened memory-mapped) plus a JSON file with the
+row ids and record metadata. The mirror is synced incrementally from Pinecone
+with ``list_paginated`` + ``fetch`` (and fully refetched every few hours to
+pick up records edited elsewhere) and answers top-k cosine searches
+in-process, returning hits in the same shape as ``search_records``
+(``{"_id", "_score", "fields"}``).
+
+Only the query still needs an embedding from Pinecone's inference API; query
+embeddings are cached, so repeated queries never leave the process.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from ..app_utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+LIST_PAGE_SIZE = 100  # maximum page size for list_paginated
+FETCH_CHUNK_SIZE = 100  # ids per fetch request
+MIRROR_SYNC_INTERVAL = 600  # seconds before a search triggers a background resync
+# Records edited outside these tools (console, other processes) keep their
+# ids, so the id diff can't see them; every so often refetch everything
+MIRROR_FULL_REFRESH_INTERVAL = 6 * 3600
+# Fetches are eventually consistent: a record refetched right after a write may
+# still come back old, so it stays stale and is retried a few times
+MIRROR_STALE_RETRIES = 6
+MIRROR_STALE_RETRY_DELAY = 2.0  # seconds
+
+
+class _Snapshot:
+    """An immutable view of one namespace: vectors, row ids and metadata."""
+
+    def __init__(self, vectors: np.ndarray, ids: list[str], metadata: dict[str, dict]):
+        self.vectors = vectors
+        self.ids = ids
+        self.metadata = metadata
+
+    def search(self, query: np.ndarray, top_k: int) -> list[dict]:
+        if not self.ids or top_k <= 0:
+            return []
+        scores = self.vectors @ query
+        top_k = min(top_k, len(self.ids))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {
+                "_id": self.ids[i],
+                "_score": float(scores[i]),
+                "fields": dict(self.metadata.get(self.ids[i], {})),
+            }
+            for i in top
+        ]
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class PineconeMirror:
+    """
+    Keeps local copies of Pinecone namespaces and searches them in-process.
+
+    ``get_index`` returns the shared async index client and ``embed_query``
+    turns a query string into a dense vector. A namespace becomes searchable
+    after its first sync (or immediately, if a copy exists on disk); until
+    then ``search`` returns None and callers fall back to Pinecone.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        namespaces: tuple[str, ...],
+        get_index,
+        embed_query,
+        sync_interval: float = MIRROR_SYNC_INTERVAL,
+    ):
+        self._directory = directory
+        self._namespaces = namespaces
+        self._get_index = get_index
+        self._embed_query = embed_query
+        self._sync_interval = sync_interval
+        self._snapshots: dict[str, _Snapshot] = {}
+        self._synced_at: dict[str, float] = {}
+        self._refreshed_at: dict[str, float] = {}
+        # id -> (expected updated_at or None, retries left)
+        self._stale: dict[str, dict[str, tuple[float | None, int]]] = {
+            ns: {} for ns in namespaces
+        }
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._sync_tasks: dict[str, asyncio.Task] = {}
+        self._embeddings = TTLCache(maxsize=1024, ttl=24 * 3600)
+        os.makedirs(directory, exist_ok=True)
+        for namespace in namespaces:
+            self._load(namespace)
+
+    # --- persistence ---
+
+    def _paths(self, namespace: str) -> tuple[str, str]:
+        base = os.path.join(self._directory, namespace)
+        return f"{base}.npy", f"{base}.json"
+
+    def _load(self, namespace: str):
+        vectors_path, meta_path = self._paths(namespace)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            vectors = np.load(vectors_path, mmap_mode="r")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.exception("Could not load local mirror of %s", namespace)
+            return
+        if len(meta.get("ids", [])) != vectors.shape[0]:
+            logger.warning("Local mirror of %s is inconsistent, resyncing", namespace)
+            return
+        self._snapshots[namespace] = _Snapshot(vectors, meta["ids"], meta["metadata"])
+        # Loaded copies are usable right away but refreshed on first search
+        self._synced_at[namespace] = 0.0
+
+    def _write(
+        self, namespace: str, vectors: np.ndarray, ids: list[str], metadata: dict
+    ) -> _Snapshot:
+        vectors_path, meta_path = self._paths(namespace)
+        with open(f"{vectors_path}.tmp", "wb") as f:
+            np.save(f, vectors)
+        with open(f"{meta_path}.tmp", "w") as f:
+            json.dump({"ids": ids, "metadata": metadata}, f)
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        return _Snapshot(np.load(vectors_path, mmap_mode="r"), ids, metadata)
+
+    def _apply(
+        self,
+        namespace: str,
+        upserts: dict[str, tuple[list[float], dict]],
+        deletes: set[str],
+    ) -> _Snapshot:
+        """Merge fetched records and deletions into a new on-disk snapshot."""
+        current = self._snapshots.get(namespace)
+        ids = list(current.ids) if current else []
+        metadata = dict(current.metadata) if current else {}
+        keep = [
+            row for row, record_id in enumerate(ids)
+            if record_id not in deletes and record_id not in upserts
+        ]
+        new_ids = list(upserts)
+        dimension = (
+            len(next(iter(upserts.values()))[0]) if upserts
+            else (current.vectors.shape[1] if current is not None else 0)
+        )
+        parts = []
+        if current is not None and keep:
+            parts.append(np.asarray(current.vectors[keep], dtype=np.float32))
+        if new_ids:
+            parts.append(
+                _normalise(np.asarray([upserts[i][0] for i in new_ids], dtype=np.float32))
+            )
+        vectors = (
+            np.concatenate(parts) if parts else np.zeros((0, dimension), np.float32)
+        )
+        ids = [ids[row] for row in keep] + new_ids
+        for record_id in deletes:
+            metadata.pop(record_id, None)
+        for record_id, (_, fields) in upserts.items():
+            metadata[record_id] = fields
+        return self._write(namespace, vectors, ids, metadata)
+
+    # --- sync ---
+
+    def mark_stale(
+        self, namespace: str, record_ids: list[str], updated_at: float | None = None
+    ):
+        """
+        Refetch these records on the next sync (after writes or deletes). With
+        `updated_at`, they stay stale until a fetch returns that version.
+        """
+        stale = self._stale.get(namespace)
+        if stale is None:
+            return
+        for record_id in record_ids:
+            expected, _ = stale.get(record_id, (None, 0))
+            if updated_at is not None and (expected is None or updated_at > expected):
+                expected = updated_at
+            stale[record_id] = (expected, MIRROR_STALE_RETRIES)
+        self.request_sync(namespace)
+
+    def request_sync(self, namespace: str):
+        """Start a background sync unless one is already running."""
+        task = self._sync_tasks.get(namespace)
+        if task is None or task.done():
+            self._sync_tasks[namespace] = asyncio.create_task(self._sync_logged(namespace))
+
+    async def _sync_logged(self, namespace: str):
+        try:
+            await self.sync(namespace)
+        except Exception:
+            logger.exception("Local mirror sync of %s failed", namespace)
+
+    async def sync(self, namespace: str):
+        """Bring the local copy of a namespace up to date with Pinecone."""
+        lock = self._locks.setdefault(namespace, asyncio.Lock())
+        async with lock:
+            index = await self._get_index()
+            listed: set[str] = set()
+            token = None
+            while True:
+                kwargs = {"namespace": namespace, "limit": LIST_PAGE_SIZE}
+                if token:
+                    kwargs["pagination_token"] = token
+                page = await index.list_paginated(**kwargs)
+                listed.update(x["id"] for x in page.vectors)
+                token = page.pagination.next if page.pagination else None
+                if not token:
+                    break
+
+            current = self._snapshots.get(namespace)
+            known = set(current.ids) if current else set()
+            # Cleared only once fetched, so a failed sync retries these ids
+            stale = dict(self._stale[namespace])
+            refreshed_at = self._refreshed_at.get(namespace)
+            full = (
+                refreshed_at is None
+                or time.monotonic() - refreshed_at > MIRROR_FULL_REFRESH_INTERVAL
+            )
+            to_fetch = sorted(listed if full else (listed - known) | (stale.keys() & listed))
+            deletes = (known - listed) | (stale.keys() - listed)
+
+            upserts: dict[str, tuple[list[float], dict]] = {}
+            chunks = [
+                to_fetch[i : i + FETCH_CHUNK_SIZE]
+                for i in range(0, len(to_fetch), FETCH_CHUNK_SIZE)
+            ]
+            responses = await asyncio.gather(
+                *(index.fetch(ids=chunk, namespace=namespace) for chunk in chunks)
+            )
+            for response in responses:
+                for record_id, vector in response.vectors.items():
+                    if vector.values:
+                        upserts[record_id] = (list(vector.values), vector.metadata or {})
+
+            if upserts or deletes or current is None:
+                self._snapshots[namespace] = await asyncio.to_thread(
+                    self._apply, namespace, upserts, deletes
+                )
+            pending = self._stale[namespace]
+            for record_id, entry in stale.items():
+                if pending.get(record_id) == entry:  # not marked again meanwhile
+                    del pending[record_id]
+            lagging = self._lagging(stale, listed, upserts)
+            for record_id, entry in lagging.items():
+                pending.setdefault(record_id, entry)
+            self._synced_at[namespace] = time.monotonic()
+            if full:
+                self._refreshed_at[namespace] = self._synced_at[namespace]
+            logger.info(
+                "Local mirror of %s synced%s: %d added/updated, %d removed",
+                namespace, " (full refresh)" if full else "", len(upserts), len(deletes),
+            )
+        if lagging:
+            asyncio.get_running_loop().call_later(
+                MIRROR_STALE_RETRY_DELAY, self.request_sync, namespace
+            )
+
+    @staticmethod
+    def _lagging(
+        stale: dict[str, tuple[float | None, int]],
+        listed: set[str],
+        upserts: dict[str, tuple[list[float], dict]],
+    ) -> dict[str, tuple[float | None, int]]:
+        """Stale ids whose fetch did not return the expected version yet."""
+        lagging = {}
+        for record_id, (expected, retries) in stale.items():
+            if record_id not in listed:
+                continue  # deleted
+            fetched = upserts.get(record_id)
+            if fetched is not None and (
+                expected is None or float(fetched[1].get("updated_at") or 0) >= expected
+            ):
+                continue
+            if retries > 0:
+                lagging[record_id] = (expected, retries - 1)
+            else:
+                logger.warning("Local mirror still has an old copy of %s", record_id)
+        return lagging
+
+    # --- search ---
+
+    def ready(self, namespace: str) -> bool:
+        return namespace in self._snapshots
+
+    async def search(self, namespace: str, query: str, top_k: int) -> list[dict] | None:
+        """Top-k cosine search; None if the namespace is not mirrored yet."""
+        if namespace not in self._stale:
+            return None
+        synced_at = self._synced_at.get(namespace)
+        if synced_at is None or time.monotonic() - synced_at > self._sync_interval:
+            self.request_sync(namespace)
+        snapshot = self._snapshots.get(namespace)
+        if snapshot is None:
+            return None
+        vector = await self._embeddings.get_or_load(
+            query, lambda: self._embed_query(query)
+        )
+        query_vector = _normalise(np.asarray(vector, dtype=np.float32))
+        if snapshot.vectors.shape[1] != query_vector.shape[0]:
+            logger.warning("Local mirror of %s has a different dimension", namespace)
+            return None
+        return snapshot.search(query_vector, top_k)
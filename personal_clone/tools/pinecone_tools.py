@@ -1,21 +1,390 @@
+import asyncio
+import copy
+import hashlib
 import json
+import logging
+import os
+import re
 import time
 import uuid
 from datetime import datetime
+from typing import AsyncIterator
 
 from google.adk.tools.tool_context import ToolContext
 from pinecone import FetchResponse, IndexModel, PineconeAsyncio, SearchQuery, Vector
 
 # from google.adk.tools.function_tool import FunctionTool
 from .. import config
+from ..app_utils.cache import TTLCache
 from ..tools.session_state_tools import (
     extract_user_ids_from_tool_context,
     save_memory_backup,
 )
 
+logger = logging.getLogger(__name__)
+
 pc = PineconeAsyncio(api_key=config.PINECONE_API_KEY)
 index_name = config.PINECONE_INDEX_NAME
 
+INDEX_HOST_TTL = 3600  # seconds before the index host is described again
+RETIRED_CLIENT_GRACE = 30  # seconds in-flight calls get before a dropped client closes
+
+
+class IndexClientManager:
+    """
+    Keeps a single long-lived ``IndexAsyncio`` client for the memory index.
+
+    The index host is cached for ``INDEX_HOST_TTL`` seconds and the client (with
+    its pooled keep-alive connections) is shared by every tool call, instead of
+    a ``describe_index`` round trip and a fresh TLS session per call. After a
+    transport or API error the client is dropped and rebuilt on the next call.
+    """
+
+    def __init__(self, name: str, host_ttl: float = INDEX_HOST_TTL):
+        self._name = name
+        self._host_ttl = host_ttl
+        self._host: str | None = None
+        self._host_checked_at = 0.0
+        self._index = None
+        self._lock: asyncio.Lock | None = None
+
+    async def get(self):
+        """Return the shared index client, describing the index only when needed."""
+        if self._index is not None and self._host_fresh():
+            return self._index
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._index is not None and self._host_fresh():
+                return self._index
+            index_descr: IndexModel = await pc.describe_index(self._name)
+            if not index_descr or not index_descr.host:
+                raise RuntimeError(f"Could not get index description for {self._name}")
+            if self._index is None or index_descr.host != self._host:
+                self._retire(self._index)
+                self._index = pc.IndexAsyncio(host=index_descr.host)
+            self._host = index_descr.host
+            self._host_checked_at = time.monotonic()
+            return self._index
+
+    def _host_fresh(self) -> bool:
+        return time.monotonic() - self._host_checked_at < self._host_ttl
+
+    def note_error(self, error: Exception):
+        """Drop the client after a failed call so the next call reconnects."""
+        if isinstance(error, (LookupError, TypeError, ValueError)):
+            return  # bad input or a missing record, not a connection problem
+        logger.warning("Pinecone call failed, resetting index client: %s", error)
+        self._retire(self._index)
+        self._index = None
+        self._host_checked_at = 0.0
+
+    def _retire(self, index):
+        if index is None:
+            return
+        try:
+            asyncio.get_running_loop().create_task(self._close_later(index))
+        except RuntimeError:
+            pass
+
+    @staticmethod
+    async def _close_later(index):
+        await asyncio.sleep(RETIRED_CLIENT_GRACE)
+        try:
+            await index.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        """Close the shared client; called on app shutdown."""
+        index, self._index = self._index, None
+        self._host_checked_at = 0.0
+        if index is not None:
+            await index.close()
+
+
+index_manager = IndexClientManager(index_name)
+
+# Search results keyed on (namespace, query, top_k); writes invalidate the
+# affected namespace so reads never serve stale memories.
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 300  # seconds
+search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+_embed_model: str | None = None
+
+
+async def embed_query(text: str) -> list[float]:
+    """Embeds a search query with the index's integrated embedding model."""
+    global _embed_model
+    if _embed_model is None:
+        index_descr: IndexModel = await pc.describe_index(index_name)
+        if not index_descr or not index_descr.embed:
+            raise RuntimeError(f"Index {index_name} has no integrated embedding model")
+        _embed_model = index_descr.embed.model
+    embeddings = await pc.inference.embed(
+        model=_embed_model,
+        inputs=[text],
+        parameters={"input_type": "query", "truncate": "END"},
+    )
+    return list(embeddings.data[0].values)
+
+
+# Optional in-process copy of the memory namespaces (see pinecone_mirror);
+# searches are served locally once a namespace has been synced.
+local_mirror = None
+if config.PINECONE_LOCAL_MIRROR:
+    from .pinecone_mirror import PineconeMirror
+
+    local_mirror = PineconeMirror(
+        directory=config.PINECONE_MIRROR_DIR,
+        namespaces=(
+            config.PINECONE_PERSONAL_NAMESPACE,
+            config.PINECONE_PROFESSIONAL_NAMESPACE,
+            "people",
+        ),
+        get_index=index_manager.get,
+        embed_query=embed_query,
+    )
+
+
+async def cached_search(namespace: str, search_query: str, top_k: int) -> list | None:
+    """
+    Runs ``search_records`` through the search cache.
+
+    Returns a private copy of the hits, or None if Pinecone returned nothing.
+    """
+
+    if local_mirror is not None:
+        try:
+            hits = await local_mirror.search(namespace, search_query, top_k)
+        except Exception as e:
+            logger.warning("Local mirror search failed, using Pinecone: %s", e)
+            hits = None
+        if hits is not None:
+            return copy.deepcopy(hits)
+
+    async def load():
+        query = SearchQuery(inputs={"text": search_query}, top_k=top_k)
+        index = await index_manager.get()
+        results = await index.search_records(namespace=namespace, query=query)
+        return results.to_dict().get("result", {}).get("hits") if results else None
+
+    hits = await search_cache.get_or_load(
+        (namespace, search_query, top_k), load, should_cache=lambda v: v is not None
+    )
+    # Callers may modify the hits in place
+    return copy.deepcopy(hits)
+
+
+def invalidate_search_cache(namespace: str, record_ids=(), updated_at=None):
+    """
+    Forget cached searches for a namespace after it was written to. The local
+    mirror refetches `record_ids`, until it sees `updated_at` if given.
+    """
+    search_cache.invalidate(lambda key: key[0] == namespace)
+    if local_mirror is not None and record_ids:
+        local_mirror.mark_stale(namespace, list(record_ids), updated_at)
+
+
+# Read-your-writes overlay: records upserted but not yet visible to fetch,
+# namespace -> {record_id: metadata}. Background tasks confirm each write with
+# exponential backoff and then drop it from the overlay.
+WRITE_CONFIRM_ATTEMPTS = 8
+WRITE_CONFIRM_BASE_DELAY = 0.5  # seconds, doubled after every attempt
+WRITE_CONFIRM_MAX_DELAY = 8.0
+_pending_writes: dict[str, dict[str, dict]] = {}
+_confirm_tasks: set[asyncio.Task] = set()
+
+
+def track_pending_writes(namespace: str, records: list[dict]):
+    """Serve just-upserted records from memory until Pinecone confirms them."""
+    pending = _pending_writes.setdefault(namespace, {})
+    for record in records:
+        pending[record["id"]] = {k: v for k, v in record.items() if k != "id"}
+    task = asyncio.create_task(
+        _confirm_writes(namespace, [record["id"] for record in records])
+    )
+    _confirm_tasks.add(task)
+    task.add_done_callback(_confirm_tasks.discard)
+
+
+async def _confirm_writes(namespace: str, record_ids: list[str]):
+    remaining = set(record_ids)
+    delay = WRITE_CONFIRM_BASE_DELAY
+    for _ in range(WRITE_CONFIRM_ATTEMPTS):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WRITE_CONFIRM_MAX_DELAY)
+        try:
+            index = await index_manager.get()
+            check = await index.fetch(ids=list(remaining), namespace=namespace)
+        except Exception as e:
+            index_manager.note_error(e)
+            continue
+        confirmed_ids = remaining.intersection(check.vectors or {})
+        if confirmed_ids:
+            for record_id in confirmed_ids:
+                _pending_writes.get(namespace, {}).pop(record_id, None)
+            remaining -= confirmed_ids
+            # Searches cached while the record was still being indexed
+            # would otherwise miss it until they expire.
+            invalidate_search_cache(namespace, confirmed_ids)
+        if not remaining:
+            return
+    for record_id in remaining:
+        _pending_writes.get(namespace, {}).pop(record_id, None)
+    logger.error(
+        "Pinecone writes not confirmed in %s namespace: %s",
+        namespace,
+        ", ".join(sorted(remaining)),
+    )
+
+
+def _identity_key(id_value) -> str:
+    return str(id_value).strip().lower().lstrip("@")
+
+
+def _parse_user_ids(user_ids) -> list[dict]:
+    if isinstance(user_ids, str):
+        try:
+            user_ids = json.loads(user_ids)
+        except ValueError:
+            return []
+    return [x for x in user_ids or [] if isinstance(x, dict) and x.get("id_value")]
+
+
+class IdentityIndex:
+    """
+    Exact map from every person identifier (email, telegram handle, ``tg_…``,
+    ``slack_…``) to the person_id that owns it.
+
+    Built from the people namespace, persisted as JSON and kept current by
+    ``create_people``/``update_people``/``delete_memory``, so resolving the
+    current user is a dict lookup rather than a semantic search. The index is
+    rebuilt in the background every ``IDENTITY_REBUILD_INTERVAL`` seconds to
+    pick up records changed outside the tools.
+    """
+
+    def __init__(self, path: str, namespace: str = "people"):
+        self._path = path
+        self._namespace = namespace
+        self._owners: dict[str, str] = {}  # identifier -> person_id
+        self._person_keys: dict[str, set[str]] = {}  # person_id -> identifiers
+        self._built_at: float | None = None
+        self._lock: asyncio.Lock | None = None
+        self._rebuild_task: asyncio.Task | None = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self._path) as f:
+                people = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.exception("Could not load people identity index")
+            return
+        for person_id, keys in people.items():
+            self._index(person_id, keys)
+        self._built_at = 0.0  # usable now, refreshed on first lookup
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({k: sorted(v) for k, v in self._person_keys.items()}, f)
+        os.replace(tmp_path, self._path)
+
+    def _index(self, person_id: str, keys):
+        for key in self._person_keys.pop(person_id, set()):
+            if self._owners.get(key) == person_id:
+                del self._owners[key]
+        keys = set(keys)
+        if keys:
+            self._person_keys[person_id] = keys
+            for key in keys:
+                self._owners[key] = person_id
+
+    def set_person(self, person_id: str, user_ids):
+        """Point all identifiers of a person at it (after create/update)."""
+        self.set_people({person_id: user_ids})
+
+    def set_people(self, people: dict[str, object]):
+        """`set_person` for many people ({person_id: user_ids}), saved once."""
+        for person_id, user_ids in people.items():
+            self._index(
+                person_id,
+                {_identity_key(x["id_value"]) for x in _parse_user_ids(user_ids)},
+            )
+        if people:
+            self._save()
+
+    def remove_person(self, person_id: str):
+        if person_id in self._person_keys:
+            self._index(person_id, ())
+            self._save()
+
+    async def rebuild(self):
+        """Rebuild the whole index from the people namespace."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            owners: dict[str, set[str]] = {}
+            index = await index_manager.get()
+            async for batch in iter_records(index, self._namespace):
+                for person_id, metadata in batch.items():
+                    owners[person_id] = {
+                        _identity_key(x["id_value"])
+                        for x in _parse_user_ids(metadata.get("user_ids"))
+                    }
+            # People created while the rebuild ran are not listed yet
+            for person_id, metadata in _pending_writes.get(self._namespace, {}).items():
+                owners.setdefault(
+                    person_id,
+                    {
+                        _identity_key(x["id_value"])
+                        for x in _parse_user_ids(metadata.get("user_ids"))
+                    },
+                )
+            self._owners, self._person_keys = {}, {}
+            for person_id, keys in owners.items():
+                self._index(person_id, keys)
+            await asyncio.to_thread(self._save)
+            self._built_at = time.monotonic()
+            logger.info("People identity index rebuilt: %d people", len(owners))
+
+    async def _rebuild_logged(self):
+        try:
+            await self.rebuild()
+        except Exception as e:
+            index_manager.note_error(e)
+            logger.exception("People identity index rebuild failed")
+
+    async def lookup(self, id_value: str) -> str | None:
+        """Return the person_id owning an identifier, building the index if needed."""
+        stale = (
+            self._built_at is None
+            or time.monotonic() - self._built_at > IDENTITY_REBUILD_INTERVAL
+        )
+        if stale and (self._rebuild_task is None or self._rebuild_task.done()):
+            self._rebuild_task = asyncio.create_task(self._rebuild_logged())
+        if self._built_at is None:
+            # Shielded so a caller's timeout doesn't throw away the first build
+            await asyncio.shield(self._rebuild_task)
+        return self._owners.get(_identity_key(id_value))
+
+
+IDENTITY_REBUILD_INTERVAL = 3600  # seconds
+identity_index = IdentityIndex(config.PEOPLE_IDENTITY_INDEX_PATH)
+
+
+async def close_pinecone_clients():
+    """Close pooled Pinecone connections (index client and control plane)."""
+    try:
+        await index_manager.close()
+    finally:
+        await pc.close()
+
 
 async def list_indexes() -> dict:
     """
@@ -74,48 +443,128 @@ async def get_records_by_id(
                 "status": "error",
                 "message": "`record_ids` MUST be a list of memory id strings, namespace must be provided",
             }
-        index_descr = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
+        index = await index_manager.get()
+        vectors = await index.fetch(ids=record_ids, namespace=namespace)
+        records_data = {
+            key: value.metadata for key, value in vectors.vectors.items()
+        }
+        # Just-written records may not be visible to fetch yet
+        pending = _pending_writes.get(namespace, {})
+        for record_id in record_ids:
+            if record_id not in records_data and record_id in pending:
+                records_data[record_id] = dict(pending[record_id])
+        if records_data and format == "full":
+            return {"status": "success", "memories": records_data}
+        elif records_data and format == "short":
+            short_data = {
+                key: {
+                    "category": value.get("category") if value else None,
+                    "short_description": (
+                        value.get("short_description") if value else None
+                    ),
+                    "tags": value.get("tags") if value else None,
+                }
+                for key, value in records_data.items()
+            }
+            return {"status": "success", "memories": short_data}
+        else:
             return {
                 "status": "failed",
-                "error": f"Could not get index description for {index_name}",
-            }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            vectors = await index.fetch(ids=record_ids, namespace=namespace)
-            records_data = {
-                key: value.metadata for key, value in vectors.vectors.items()
+                "memories": f"no records with id {record_ids} found",
             }
-            if records_data and format == "full":
-                return {"status": "success", "memories": records_data}
-            elif records_data and format == "short":
-                short_data = {
-                    key: {
-                        "category": value.get("category") if value else None,
-                        "short_description": (
-                            value.get("short_description") if value else None
-                        ),
-                        "tags": value.get("tags") if value else None,
-                    }
-                    for key, value in records_data.items()
-                }
-                return {"status": "success", "memories": short_data}
-            else:
-                return {
-                    "status": "failed",
-                    "memories": f"no records with id {record_ids} found",
-                }
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
-async def list_records(tool_context: ToolContext, namespace: str) -> dict:
+LIST_PAGE_SIZE = 100  # list_paginated maximum
+FETCH_BATCH_SIZE = 100  # ids per fetch request, Pinecone's fetch limit
+LIST_FETCH_CONCURRENCY = 4
+
+
+async def iter_record_ids(index, namespace: str) -> AsyncIterator[list[str]]:
+    """Yields the record ids of a namespace one list page at a time."""
+    token = None
+    while True:
+        kwargs = {"namespace": namespace, "limit": LIST_PAGE_SIZE}
+        if token:
+            kwargs["pagination_token"] = token
+        page = await index.list_paginated(**kwargs)
+        ids = [x["id"] for x in page.vectors]
+        if ids:
+            yield ids
+        token = page.pagination.next if page.pagination else None
+        if not token:
+            return
+
+
+async def iter_records(
+    index, namespace: str, concurrency: int = LIST_FETCH_CONCURRENCY
+) -> AsyncIterator[dict[str, dict]]:
+    """
+    Yields ``{record_id: metadata}`` batches for a whole namespace.
+
+    Fetches of up to ``FETCH_BATCH_SIZE`` ids run in the background while
+    listing continues; listing pauses once ``concurrency`` fetches are in
+    flight. Batches are yielded in completion order.
+    """
+
+    async def fetch(ids: list[str]) -> dict[str, dict]:
+        response = await index.fetch(ids=ids, namespace=namespace)
+        return {key: value.metadata or {} for key, value in response.vectors.items()}
+
+    pending: set[asyncio.Task] = set()
+    try:
+        async for ids in iter_record_ids(index, namespace):
+            for i in range(0, len(ids), FETCH_BATCH_SIZE):
+                pending.add(asyncio.create_task(fetch(ids[i : i + FETCH_BATCH_SIZE])))
+            done = {task for task in pending if task.done()}
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            else:
+                pending -= done
+            for task in done:
+                yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _parse_date(value: str | None, end_of_day: bool = False) -> int | None:
+    if not value:
+        return None
+    date_value = datetime.strptime(value, "%Y-%m-%d")
+    if end_of_day:
+        date_value = date_value.replace(hour=23, minute=59, second=59)
+    return int(date_value.timestamp())
+
+
+async def list_records(
+    tool_context: ToolContext,
+    namespace: str,
+    category: str | None = None,
+    tag: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+) -> dict:
     """
     Fetches all memories/records from a namespace in Pinecone index.
     The function specifically fetches the memory_id, category, short_description and tags.
 
     Args:
         namespace (str): The name of the Pinecone index namespace ("personal" for personal memories or "professional" for professional experience)..
-        top_k (int): How many results to return. Start with small numbers (3-5) and only increase this number if you want to do a broader search.
+        category (str): Optional. Only return records of this category.
+        tag (str): Optional. Only return records that have this tag.
+        date_from (str): Optional. Only return records created on or after this date (YYYY-MM-DD).
+        date_to (str): Optional. Only return records created on or before this date (YYYY-MM-DD).
 
     Returns:
         dict: The result of the fetch operation along with memory_id, category, short_description and tags of records.
@@ -136,33 +585,46 @@ async def list_records(tool_context: ToolContext, namespace: str) -> dict:
             "search_results": f"sorry, this information is only available to {config.TEAM_DOMAIN} members",
         }
     try:
+        created_from = _parse_date(date_from)
+        created_to = _parse_date(date_to, end_of_day=True)
+    except ValueError:
+        return {
+            "status": "args error",
+            "search_results": "`date_from` and `date_to` must be in YYYY-MM-DD format",
+        }
+    tag = tag.lower() if tag else None
+
+    def matches(metadata: dict) -> bool:
+        if category and metadata.get("category") != category:
+            return False
+        if tag and tag not in [t.lower() for t in metadata.get("tags") or []]:
+            return False
+        created_at = metadata.get("created_at")
+        if created_from is not None and (created_at is None or created_at < created_from):
+            return False
+        if created_to is not None and (created_at is None or created_at > created_to):
+            return False
+        return True
 
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
+    try:
+        memories = {}
+        index = await index_manager.get()
+        async for batch in iter_records(index, namespace):
+            for record_id, metadata in batch.items():
+                if matches(metadata):
+                    memories[record_id] = {
+                        "category": metadata.get("category"),
+                        "short_description": metadata.get("short_description"),
+                        "tags": metadata.get("tags"),
+                    }
+        if memories:
             return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
+                "status": "success",
+                "search_results": {"status": "success", "memories": memories},
             }
-        full_results = []
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            results = await index.list_paginated(namespace=namespace, limit=20)
-            full_results.extend(results.vectors)
-            while results.pagination:
-                results = await index.list_paginated(
-                    namespace=namespace, pagination_token=results.pagination.next
-                )
-                full_results.extend(results.vectors)
-            if full_results:
-                mem_ids = [x["id"] for x in full_results]
-                memories = await get_records_by_id(
-                    tool_context,
-                    record_ids=mem_ids,
-                    namespace=namespace,
-                    format="short",
-                )
-                return {"status": "success", "search_results": memories}
-            return {"status": "failed", "search_results": "nothing found"}
+        return {"status": "failed", "search_results": "nothing found"}
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -182,6 +644,98 @@ def confirmed(tool_context: ToolContext):
         return False
 
 
+# Write-time dedupe: new memories/people are compared with their nearest
+# neighbours (and with writes not yet searchable) before the user confirms.
+DUPLICATE_SCORE_THRESHOLD = 0.9
+DUPLICATE_CANDIDATES = 5
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _id_values(user_ids) -> set[str]:
+    if isinstance(user_ids, str):
+        try:
+            user_ids = json.loads(user_ids)
+        except ValueError:
+            return set()
+    return {
+        normalize_text(str(x.get("id_value", "")))
+        for x in user_ids or []
+        if isinstance(x, dict) and x.get("id_value")
+    }
+
+
+async def find_duplicates(
+    namespace: str, text: str, user_ids: list[dict] | None = None
+) -> list[dict]:
+    """
+    Returns existing records that look like duplicates of a new one.
+
+    A record matches when its normalized text hash is identical, when (for
+    people) it shares an identifier, or when its similarity score is at
+    least ``DUPLICATE_SCORE_THRESHOLD``.
+    """
+    new_hash = text_hash(text)
+    new_ids = _id_values(user_ids)
+    candidates = []
+    for record_id, fields in _pending_writes.get(namespace, {}).items():
+        candidates.append({"_id": record_id, "_score": None, "fields": fields})
+    candidates.extend(await cached_search(namespace, text, DUPLICATE_CANDIDATES) or [])
+
+    duplicates = {}
+    for hit in candidates:
+        fields = hit.get("fields", {})
+        score = hit.get("_score")
+        reasons = []
+        if (fields.get("text_hash") or text_hash(fields.get("text", ""))) == new_hash:
+            reasons.append("identical text")
+        shared = new_ids & _id_values(fields.get("user_ids"))
+        if shared:
+            reasons.append(f"shared identifiers: {', '.join(sorted(shared))}")
+        if score is not None and score >= DUPLICATE_SCORE_THRESHOLD:
+            reasons.append(f"similarity {score:.2f}")
+        if reasons and hit["_id"] not in duplicates:
+            duplicates[hit["_id"]] = {
+                "id": hit["_id"],
+                "reason": "; ".join(reasons),
+                "short_description": fields.get("short_description")
+                or fields.get("text"),
+            }
+    return list(duplicates.values())
+
+
+def _can_read(user_id: str | None, namespace: str) -> bool:
+    """Same access rules as `search_memories`."""
+    if user_id in config.SUPERUSERS:
+        return True
+    if namespace == "personal":
+        return False
+    return bool(user_id) and user_id.lower().endswith(config.TEAM_DOMAIN)
+
+
+async def _duplicates_or_empty(
+    tool_context: ToolContext, namespace: str, text: str, user_ids=None
+) -> list[dict]:
+    # Matches are shown to the caller, so only users who could search the
+    # namespace get them
+    if not _can_read(tool_context.state.get("user_id"), namespace):
+        return []
+    # Dedupe is advisory; a failed lookup must not block the write
+    try:
+        return await find_duplicates(namespace, text, user_ids)
+    except Exception as e:
+        index_manager.note_error(e)
+        logger.warning("Duplicate check in %s failed: %s", namespace, e)
+        return []
+
+
 async def create_memory(
     tool_context: ToolContext,
     namespace: str,
@@ -232,11 +786,20 @@ async def create_memory(
             "related_people": related_people,
             "related_memories": related_memories,
         }
-        return {
+        response = {
             "status": "requires confirmation",
             "message": "Memory creation must be confirmed by user. The user must explicitly confirm by replying with `YES` in their LATEST message.",
             "args": json.dumps(arg_dict),
         }
+        if namespace in ("personal", "professional") and text:
+            duplicates = await _duplicates_or_empty(tool_context, namespace, text)
+            if duplicates:
+                response["possible_duplicates"] = duplicates
+                response["message"] += (
+                    " Similar memories already exist (see `possible_duplicates`);"
+                    " show them to the user and ask whether to update one of them instead."
+                )
+        return response
 
     try:
 
@@ -288,6 +851,7 @@ async def create_memory(
             "short_description": short_description,
             "category": category,
             "tags": tags,
+            "text_hash": text_hash(text),
         }
         if related_people:
             single_record["related_people"] = related_people
@@ -296,36 +860,17 @@ async def create_memory(
 
         records = [single_record]
 
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
-            return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
-            }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            await index.upsert_records(namespace=namespace, records=records)
-
-            # verifying that memory was updated/created
-            attempts = 0
-            check = FetchResponse(namespace=namespace, vectors={}, usage=None)
-            while attempts < 10 and not check.vectors:  # type: ignore
-                check = await index.fetch(
-                    ids=[x["id"] for x in records], namespace=namespace
-                )
-                time.sleep(1.5)
-                attempts += 1
+        index = await index_manager.get()
+        await index.upsert_records(namespace=namespace, records=records)
+        invalidate_search_cache(namespace)
+        track_pending_writes(namespace, records)
 
-        if check and check.vectors:
-            return {
-                "status": "success",
-                "response": f"id {records[0].get('id')} successfully created in {namespace} namespace",
-            }
-        else:
-            return {
-                "status": "failed",
-                "response": f"id {records[0].get('id')} not created in {namespace}",
-            }
+        return {
+            "status": "success",
+            "response": f"id {records[0].get('id')} successfully created in {namespace} namespace",
+        }
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -361,11 +906,32 @@ async def create_people(
             "user_ids": user_ids,
             "relations": relations,
         }
-        return {
+        response = {
             "status": "requires confirmation",
             "message": "Memory creation must be confirmed by user. The user must explicitly confirm by replying with `YES` in their LATEST message.",
             "args": json.dumps(arg_dict),
         }
+        try:
+            user_ids_list = json.loads(user_ids) if user_ids else []
+        except ValueError:
+            user_ids_list = []
+        if first_name:
+            user_ids_str = ", ".join(
+                [x.get("id_value", "") for x in user_ids_list if isinstance(x, dict)]
+            )
+            duplicates = await _duplicates_or_empty(
+                tool_context,
+                "people",
+                f"{first_name} {last_name}. IDs: {user_ids_str}".strip(),
+                user_ids_list,
+            )
+            if duplicates:
+                response["possible_duplicates"] = duplicates
+                response["message"] += (
+                    " This person may already exist (see `possible_duplicates`);"
+                    " show the matches to the user and ask whether to update one of them instead."
+                )
+        return response
 
     try:
         namespace = "people"
@@ -409,35 +975,18 @@ async def create_people(
 
         records = [single_record]
 
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
-            return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
-            }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            await index.upsert_records(namespace=namespace, records=records)
-            # verifying that memory was updated/created
-            attempts = 0
-            check = FetchResponse(namespace=namespace, vectors={}, usage=None)
-            while attempts < 10 and not check.vectors:  # type: ignore
-                check = await index.fetch(
-                    ids=[x["id"] for x in records], namespace=namespace
-                )
-                time.sleep(1.5)
-                attempts += 1
+        index = await index_manager.get()
+        await index.upsert_records(namespace=namespace, records=records)
+        invalidate_search_cache(namespace)
+        track_pending_writes(namespace, records)
+        identity_index.set_person(person_id, user_ids_list)
 
-        if check and check.vectors:
-            return {
-                "status": "success",
-                "response": f"person {records[0].get('id')} ({first_name} {last_name}) successfully updated in {namespace} namespace",
-            }
-        else:
-            return {
-                "status": "failed",
-                "response": f"person {records[0].get('id')} ({first_name} {last_name}) not inserted to {namespace}",
-            }
+        return {
+            "status": "success",
+            "response": f"person {records[0].get('id')} ({first_name} {last_name}) successfully updated in {namespace} namespace",
+        }
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -524,49 +1073,46 @@ async def update_memory(
         records["updated_at"] = int(datetime.now().timestamp())
         if "related_memories" in updates_dict:
             records["related_memories"] = json.dumps(updates_dict["related_memories"])
+        if "text" in updates_dict:
+            records["text_hash"] = text_hash(str(updates_dict["text"]))
 
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
+        index = await index_manager.get()
+        memory_to_update = await index.fetch(ids=[memory_id], namespace=namespace)
+        if not memory_to_update.vectors:
             return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
+                "status": "error",
+                "message": f"Memory {memory_id} not found in namespace {namespace}",
             }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            memory_to_update = await index.fetch(ids=[memory_id], namespace=namespace)
-            if not memory_to_update.vectors:
-                return {
-                    "status": "error",
-                    "message": f"Memory {memory_id} not found in namespace {namespace}",
-                }
 
-            memory_creator = (
-                memory_to_update.vectors[memory_id]
-                .to_dict()
-                .get("metadata", {})
-                .get("user_id")
-            )
+        memory_creator = (
+            memory_to_update.vectors[memory_id]
+            .to_dict()
+            .get("metadata", {})
+            .get("user_id")
+        )
 
-            if memory_creator not in current_user_ids and not any(
-                user_id in config.SUPERUSERS for user_id in current_user_ids
-            ):
-                return {
-                    "status": "forbidden",
-                    "message": f"Memory {memory_id} was created by {memory_creator} and can only be modified by this user",
-                }
-            memory_dict = (
-                memory_to_update.vectors[memory_id].to_dict().get("metadata", {})
-            )
-            backup = await save_memory_backup(
-                tool_context=tool_context,
-                memory_dict=json.dumps(memory_dict),
-            )
-            if not backup:
-                return {
-                    "status": "failed",
-                    "message": f"Could not create backup of memory {memory_id} before update",
-                }
-            await index.update(id=memory_id, namespace=namespace, set_metadata=records)
-        time.sleep(1.5)
+        if memory_creator not in current_user_ids and not any(
+            user_id in config.SUPERUSERS for user_id in current_user_ids
+        ):
+            return {
+                "status": "forbidden",
+                "message": f"Memory {memory_id} was created by {memory_creator} and can only be modified by this user",
+            }
+        memory_dict = (
+            memory_to_update.vectors[memory_id].to_dict().get("metadata", {})
+        )
+        backup = await save_memory_backup(
+            tool_context=tool_context,
+            memory_dict=json.dumps(memory_dict),
+        )
+        if not backup:
+            return {
+                "status": "failed",
+                "message": f"Could not create backup of memory {memory_id} before update",
+            }
+        await index.update(id=memory_id, namespace=namespace, set_metadata=records)
+        invalidate_search_cache(namespace, [memory_id], records["updated_at"])
+        await asyncio.sleep(1.5)
         result = await get_records_by_id(
             tool_context=tool_context,
             record_ids=[memory_id],
@@ -580,6 +1126,7 @@ async def update_memory(
         }
 
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -658,50 +1205,47 @@ async def update_people(
         if "relations" in updates_dict:
             records["relations"] = json.dumps(updates_dict["relations"])
 
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
+        index = await index_manager.get()
+        person_to_update = await index.fetch(ids=[person_id], namespace=namespace)
+        if not person_to_update.vectors:
             return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
+                "status": "error",
+                "message": f"Person {person_id} not found in namespace {namespace}",
             }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            person_to_update = await index.fetch(ids=[person_id], namespace=namespace)
-            if not person_to_update.vectors:
-                return {
-                    "status": "error",
-                    "message": f"Person {person_id} not found in namespace {namespace}",
-                }
 
-            person_ids_dict = (
-                person_to_update.vectors[person_id]
-                .to_dict()
-                .get("metadata", {})
-                .get("user_ids", {})
-            )
-            person_ids = [x["id_value"] for x in json.loads(person_ids_dict)]
-
-            if not any(
-                user_id in person_ids for user_id in current_user_ids
-            ) and not any(user_id in config.SUPERUSERS for user_id in current_user_ids):
-                return {
-                    "status": "forbidden",
-                    "message": f"Person {person_id}  can only be modified by this user or superusers",
-                }
-            memory_dict = (
-                person_to_update.vectors[person_id].to_dict().get("metadata", {})
-            )
-            backup = await save_memory_backup(
-                tool_context=tool_context, memory_dict=json.dumps(memory_dict)
-            )
-            if not backup:
-                return {
-                    "status": "failed",
-                    "message": f"Could not create backup of person {person_id} before update",
-                }
+        person_ids_dict = (
+            person_to_update.vectors[person_id]
+            .to_dict()
+            .get("metadata", {})
+            .get("user_ids", {})
+        )
+        person_ids = [x["id_value"] for x in json.loads(person_ids_dict)]
 
-            await index.update(id=person_id, namespace=namespace, set_metadata=records)
+        if not any(
+            user_id in person_ids for user_id in current_user_ids
+        ) and not any(user_id in config.SUPERUSERS for user_id in current_user_ids):
+            return {
+                "status": "forbidden",
+                "message": f"Person {person_id}  can only be modified by this user or superusers",
+            }
+        memory_dict = (
+            person_to_update.vectors[person_id].to_dict().get("metadata", {})
+        )
+        backup = await save_memory_backup(
+            tool_context=tool_context, memory_dict=json.dumps(memory_dict)
+        )
+        if not backup:
+            return {
+                "status": "failed",
+                "message": f"Could not create backup of person {person_id} before update",
+            }
 
-        time.sleep(1.5)
+        await index.update(id=person_id, namespace=namespace, set_metadata=records)
+        invalidate_search_cache(namespace, [person_id], records["updated_at"])
+        if "user_ids" in updates_dict:
+            identity_index.set_person(person_id, updates_dict["user_ids"])
+
+        await asyncio.sleep(1.5)
         result = await get_records_by_id(
             tool_context=tool_context,
             record_ids=[person_id],
@@ -715,6 +1259,7 @@ async def update_people(
         }
 
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -747,41 +1292,39 @@ async def delete_memory(
             "message": "sorry, only master user can perform delete operations right now",
         }
     try:
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
+        index = await index_manager.get()
+
+        record_to_delete = await index.fetch(ids=[record_id], namespace=namespace)
+
+        memory_dict = (
+            record_to_delete.vectors[record_id].to_dict().get("metadata", {})
+        )
+        backup = await save_memory_backup(
+            tool_context=tool_context,
+            memory_dict=json.dumps(memory_dict),
+        )
+        if not backup:
             return {
                 "status": "failed",
-                "error": f"Could not get index description for {index_name}",
+                "message": f"Could not create backup of memory {record_id} before deleting",
             }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-
-            record_to_delete = await index.fetch(ids=[record_id], namespace=namespace)
 
-            memory_dict = (
-                record_to_delete.vectors[record_id].to_dict().get("metadata", {})
-            )
-            backup = await save_memory_backup(
-                tool_context=tool_context,
-                memory_dict=json.dumps(memory_dict),
-            )
-            if not backup:
-                return {
-                    "status": "failed",
-                    "message": f"Could not create backup of memory {record_id} before deleting",
-                }
-
-            await index.delete(ids=[record_id], namespace=namespace)
+        await index.delete(ids=[record_id], namespace=namespace)
+        invalidate_search_cache(namespace, [record_id])
+        _pending_writes.get(namespace, {}).pop(record_id, None)
+        if namespace == "people":
+            identity_index.remove_person(record_id)
 
-            attempts = 0
-            check = FetchResponse(
-                namespace=namespace,
-                vectors={"test": Vector(id="1", values=[1, 2, 3])},
-                usage=None,
-            )
-            while attempts < 10 and check.vectors:  # type: ignore
-                check = await index.fetch([record_id], namespace=namespace)
-                time.sleep(1.5)
-                attempts += 1
+        attempts = 0
+        check = FetchResponse(
+            namespace=namespace,
+            vectors={"test": Vector(id="1", values=[1, 2, 3])},
+            usage=None,
+        )
+        while attempts < 10 and check.vectors:  # type: ignore
+            check = await index.fetch([record_id], namespace=namespace)
+            await asyncio.sleep(1.5)
+            attempts += 1
 
         if check and check.vectors:
             return {
@@ -793,6 +1336,7 @@ async def delete_memory(
             "message": f"record {record_id} successfully deleted from {namespace}",
         }
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -826,21 +1370,12 @@ async def search_memories(
             "search_results": f"sorry, this information is only available to {config.TEAM_DOMAIN} members",
         }
     try:
-        query = SearchQuery(inputs={"text": search_query}, top_k=top_k)
-
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
-            return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
-            }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            results = await index.search_records(namespace=namespace, query=query)
-            if results:
-                summary = results.to_dict().get("result", {}).get("hits")
-                return {"status": "success", "search_results": summary}
-            return {"status": "failed", "search_results": "nothing found"}
+        summary = await cached_search(namespace, search_query, top_k)
+        if summary is not None:
+            return {"status": "success", "search_results": summary}
+        return {"status": "failed", "search_results": "nothing found"}
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
@@ -873,51 +1408,44 @@ async def search_memories_prefetch(
             "search_results": f"sorry, this information is only available to {config.TEAM_DOMAIN} members",
         }
     try:
-        query = SearchQuery(inputs={"text": search_query}, top_k=top_k)
-
-        index_descr: IndexModel = await pc.describe_index(index_name)
-        if not index_descr or not index_descr.host:
-            return {
-                "status": "failed",
-                "error": f"Could not get index description for {index_name}",
-            }
-        async with pc.IndexAsyncio(index_descr.host) as index:
-            results = await index.search_records(namespace=namespace, query=query)
-            if results:
-                summary = results.to_dict().get("result", {}).get("hits")
-                return {"status": "success", "search_results": summary}
-            return {"status": "failed", "search_results": "nothing found"}
+        summary = await cached_search(namespace, search_query, top_k)
+        if summary is not None:
+            return {"status": "success", "search_results": summary}
+        return {"status": "failed", "search_results": "nothing found"}
     except Exception as e:
+        index_manager.note_error(e)
         return {"status": "failed", "error": str(e)}
 
 
-def get_person_from_search(search_results: list[dict], user_id: str):
+async def get_person_by_user_id(user_id: str) -> dict | None:
     """
-    A helper function to extract person records from search results.
-    Args:
-        search_results (dict): The search results returned by the search_memories function.
+    Resolves a user id (email, ``tg_…``, ``slack_…``, handle) to its person
+    record through the identity index.
 
     Returns:
-        dict: A dictionary containing person records.
+        dict: the person hit (``_id`` and ``fields`` with decoded `user_ids`/`relations`), or None if the id is unknown.
     """
-    try:
-        results = (
-            [
-                x
-                for x in search_results
-                if user_id in x.get("fields", {}).get("user_ids")
-            ]
-            if search_results
-            else None
-        )
-        if results:
-            person_data = results[0].copy()
-            for key, value in person_data.get("fields", {}).items():
-                if key in ("user_ids", "relations") and value:
-                    person_data["fields"][key] = json.loads(value)
-            return person_data
-    except Exception as e:
-        return {"status": "failed", "error": str(e)}
+    if user_id not in config.SUPERUSERS and not user_id.lower().endswith(
+        config.TEAM_DOMAIN
+    ):
+        return None
+    person_id = await identity_index.lookup(user_id)
+    if person_id is None:
+        return None
+    fields = _pending_writes.get("people", {}).get(person_id)
+    if fields is None:
+        index = await index_manager.get()
+        response = await index.fetch(ids=[person_id], namespace="people")
+        vector = response.vectors.get(person_id)
+        if vector is None:
+            identity_index.remove_person(person_id)
+            return None
+        fields = vector.metadata or {}
+    fields = dict(fields)
+    for key in ("user_ids", "relations"):
+        if isinstance(fields.get(key), str) and fields[key]:
+            fields[key] = json.loads(fields[key])
+    return {"_id": person_id, "fields": fields}
 
 
 # def run_tool_confirmation_test(tool_context: ToolContext) -> dict:
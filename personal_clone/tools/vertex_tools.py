@@ -5,14 +5,27 @@ from google import genai
 from google.genai import types
 
 from .. import config
+from ..app_utils.cache import TTLCache
 
 client = genai.Client(api_key=config.GEMINI_API_KEY, vertexai=False)
 
+# display_name -> store resource name, and store resource name -> document
+# listing. Store creation/deletion and uploads keep them up to date.
+STORE_CACHE_TTL = 600  # seconds
+_store_names = TTLCache(maxsize=64, ttl=STORE_CACHE_TTL)
+_store_documents = TTLCache(maxsize=64, ttl=STORE_CACHE_TTL)
+
+
+def _remember_store(store) -> None:
+    if store.display_name and store.name:
+        _store_names.set(store.display_name, store.name)
+
 
 def create_file_search_store(display_name: str):
     # Create the file search store with an optional display name
     config = types.CreateFileSearchStoreConfigDict(display_name=display_name)
     file_search_store = client.file_search_stores.create(config=config)
+    _remember_store(file_search_store)
     return file_search_store
 
 
@@ -20,29 +33,60 @@ def get_file_search_store(store_name: str):
 
     file_search_store_list = client.file_search_stores.list()
     for store in file_search_store_list:
+        _remember_store(store)
         if store.display_name == store_name:
             return store
     return None
 
 
+async def get_file_search_store_async(store_name: str):
+    """Non-blocking `get_file_search_store` for use inside the event loop."""
+    async for store in await client.aio.file_search_stores.list():
+        _remember_store(store)
+        if store.display_name == store_name:
+            return store
+    return None
+
+
+def resolve_store_name(display_name: str) -> str | None:
+    """Returns the resource name of a store by display name, using the cache."""
+    name = _store_names.get(display_name)
+    if name is None:
+        store = get_file_search_store(display_name)
+        name = store.name if store else None
+    return name
+
+
+async def resolve_store_name_async(display_name: str) -> str | None:
+    """Non-blocking `resolve_store_name`; concurrent lookups share one listing."""
+
+    async def load():
+        store = await get_file_search_store_async(display_name)
+        return store.name if store else None
+
+    return await _store_names.get_or_load(
+        display_name, load, should_cache=lambda name: name is not None
+    )
+
+
 def upload_file_to_store(
     file_path: str, unique_file_name: str, store_name: str = "rag_documents"
 ):
     # Upload and import a file into the file search store, supply a unique file name which will be visible in citations
     try:
-        file_search_store = get_file_search_store(store_name)
+        file_search_store_name = resolve_store_name(store_name)
     except Exception as e:
         return {"status": "error", "message": str(e)}
-    if not file_search_store:
+    if not file_search_store_name:
         return {
             "status": "error",
             "message": f"File search store `{store_name}` not found.",
         }
-    if file_search_store.name:
+    if file_search_store_name:
         try:
             operation = client.file_search_stores.upload_to_file_search_store(
                 file=file_path,
-                file_search_store_name=file_search_store.name,
+                file_search_store_name=file_search_store_name,
                 config={
                     "display_name": unique_file_name,
                 },
@@ -51,6 +95,7 @@ def upload_file_to_store(
             while not operation.done:
                 time.sleep(5)
                 operation = client.operations.get(operation)
+            _store_documents.pop(file_search_store_name)
             return {
                 "status": "success",
                 "message": f"File {unique_file_name} uploaded successfully.",
@@ -100,14 +145,14 @@ async def list_available_stores() -> list | dict:
         list: list of store names or dict with an error message
     """
     try:
-        stores = client.file_search_stores.list()
-        store_names = [x.display_name for x in stores]
+        stores = await client.aio.file_search_stores.list()
+        store_names = [x.display_name async for x in stores]
         return store_names
     except Exception as e:
         return {"status": "failed", "error": str(e)}
 
 
-def list_documents_in_store(store_name: str):
+async def list_documents_in_store(store_name: str):
     """
     Lists all available documents in a user's file search store.
 
@@ -117,32 +162,42 @@ def list_documents_in_store(store_name: str):
         dict: success or error message, along with a list of documents and their respecitve names and update dates or error message.
     """
     try:
-        file_search_store = get_file_search_store(store_name)
-        if not (file_search_store and file_search_store.name):
+        file_search_store_name = await resolve_store_name_async(store_name)
+        if not file_search_store_name:
             return {"status": "error", "message": "could not access file search store"}
-        store_documents = []
-        files_pager = client.file_search_stores.documents.list(
-            parent=file_search_store.name
+
+        async def load():
+            store_documents = []
+            files_pager = await client.aio.file_search_stores.documents.list(
+                parent=file_search_store_name
+            )
+            async for file in files_pager:
+                document_info = {
+                    "display_name": file.display_name,
+                    "update_time": file.update_time,
+                    # "name": file.name
+                }
+                store_documents.append(document_info)
+            return store_documents
+
+        store_documents = await _store_documents.get_or_load(
+            file_search_store_name, load
         )
-        for file in files_pager:
-            document_info = {
-                "display_name": file.display_name,
-                "update_time": file.update_time,
-                # "name": file.name
-            }
-            store_documents.append(document_info)
-        return {"status": "success", "files": store_documents}
+        return {"status": "success", "files": list(store_documents)}
     except Exception as e:
+        _store_names.pop(store_name)
         return {"status": "error", "message": str(e)}
 
 
 def delete_file_search_store(display_name: str):
-    file_search_store = get_file_search_store(display_name)
-    if file_search_store and file_search_store.name:
+    file_search_store_name = resolve_store_name(display_name)
+    if file_search_store_name:
         _ = client.file_search_stores.delete(
-            name=file_search_store.name,
+            name=file_search_store_name,
             config=types.DeleteFileSearchStoreConfig(force=True),
         )
+        _store_names.pop(display_name)
+        _store_documents.pop(file_search_store_name)
     return None
 
 
@@ -158,20 +213,20 @@ async def search_file_store(query: str, store_name: str) -> dict:
         dict: search results along with grounding data
     """
     try:
-        file_search_store = get_file_search_store(store_name)
-        if not file_search_store or not file_search_store.name:
+        file_search_store_name = await resolve_store_name_async(store_name)
+        if not file_search_store_name:
             return {
                 "status": "error",
                 "message": f"File search store `{store_name}` not found.",
             }
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash",
             contents=query,
             config=types.GenerateContentConfig(
                 tools=[
                     types.Tool(
                         file_search=types.FileSearch(
-                            file_search_store_names=[file_search_store.name]
+                            file_search_store_names=[file_search_store_name]
                         )
                     )
                 ]
@@ -197,4 +252,6 @@ async def search_file_store(query: str, store_name: str) -> dict:
             return {"search_results": response.text, "grounding_data": grounding_dict}
         return {"search_results": "nothing found"}
     except Exception as e:
+        # The store may have been removed elsewhere; resolve it again next time
+        _store_names.pop(store_name)
         return {"error": str(e)}